@@ -1,27 +1,73 @@
 """Azure Functions HTTP endpoints for document orchestrator."""
 
-import json
+import asyncio
 import logging
 
 import azure.functions as func
-
-from src.opsai_document_orchestrator.config import load_config, save_config, reload_config
+import orjson
+
+from src.opsai_document_orchestrator.config import (
+    ConfigError,
+    config_to_dict,
+    load_config,
+    save_config,
+    reload_config,
+    validate_config_data,
+)
 from src.opsai_document_orchestrator.factory import get_document_service, get_analyzer_builder
-from src.opsai_document_orchestrator.models import AzureSettings, Category, PipelineConfig
+from src.opsai_document_orchestrator.models import (
+    AnalysisResult,
+    AzureSettings,
+    Category,
+    PipelineConfig,
+)
 
 app = func.FunctionApp(http_auth_level=func.AuthLevel.FUNCTION)
 logger = logging.getLogger(__name__)
 
+# Serialized GET /config body and the config it was built from. load_config returns
+# the same object until the file's mtime changes, so identity is a valid cache key.
+_config_json_cache: tuple[PipelineConfig, bytes] | None = None
+
 
 # --- Helper Functions ---
 
+def _dumps(data: dict) -> bytes:
+    """Serialize response body."""
+    return orjson.dumps(data, default=str, option=orjson.OPT_NAIVE_UTC)
+
+
 def json_response(data: dict, status: int = 200) -> func.HttpResponse:
     """Create JSON HTTP response."""
-    return func.HttpResponse(
-        json.dumps(data, default=str),
-        status_code=status,
-        mimetype="application/json",
-    )
+    return func.HttpResponse(_dumps(data), status_code=status, mimetype="application/json")
+
+
+def _result_body(result: AnalysisResult) -> bytes:
+    """
+    Serialize an analysis result response body.
+    
+    Fields loaded from storage are still raw JSON, so they are embedded as-is
+    instead of being decoded and re-encoded.
+    """
+    raw = result.raw_fields_json
+    return _dumps({
+        "document_id": result.document_id,
+        "category_id": result.category_id,
+        "extracted_fields": orjson.Fragment(raw) if raw else result.extracted_fields,
+        "confidence": result.confidence,
+        "analyzed_at": result.analyzed_at,
+    })
+
+
+async def result_response(result: AnalysisResult) -> func.HttpResponse:
+    """
+    Create an analysis result response, serializing in a worker thread.
+    
+    The body scales with document size (extracted fields), so building it
+    off the event loop keeps a large payload from stalling other requests.
+    """
+    body = await asyncio.to_thread(_result_body, result)
+    return func.HttpResponse(body, status_code=200, mimetype="application/json")
 
 
 def error_response(message: str, status: int = 400) -> func.HttpResponse:
@@ -32,7 +78,7 @@ def error_response(message: str, status: int = 400) -> func.HttpResponse:
 # --- Document Endpoints ---
 
 @app.route(route="documents/upload", methods=["POST"])
-def upload_document(req: func.HttpRequest) -> func.HttpResponse:
+async def upload_document(req: func.HttpRequest) -> func.HttpResponse:
     """
     POST /api/documents/upload
     
@@ -46,11 +92,10 @@ def upload_document(req: func.HttpRequest) -> func.HttpResponse:
             return error_response("No file provided", 400)
 
         filename = file.filename or "document"
-        content = file.read()
         content_type = file.content_type or "application/octet-stream"
 
         service = get_document_service()
-        document_id, blob_url = service.upload_document(filename, content, content_type)
+        document_id, blob_url = await service.upload_document(filename, file.stream, content_type)
 
         logger.info(f"Document uploaded: {document_id}")
         return json_response({
@@ -65,7 +110,7 @@ def upload_document(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="documents/{document_id}/analyze", methods=["POST"])
-def analyze_document(req: func.HttpRequest) -> func.HttpResponse:
+async def analyze_document(req: func.HttpRequest) -> func.HttpResponse:
     """
     POST /api/documents/{document_id}/analyze
     
@@ -83,16 +128,10 @@ def analyze_document(req: func.HttpRequest) -> func.HttpResponse:
             return error_response("blob_url required in request body", 400)
 
         service = get_document_service()
-        result = service.analyze_document(document_id, blob_url)
+        result = await service.analyze_document(document_id, blob_url)
 
         logger.info(f"Document analyzed: {document_id}")
-        return json_response({
-            "document_id": result.document_id,
-            "category_id": result.category_id,
-            "extracted_fields": result.extracted_fields,
-            "confidence": result.confidence,
-            "analyzed_at": result.analyzed_at.isoformat(),
-        })
+        return await result_response(result)
 
     except Exception as e:
         logger.exception("Analysis failed")
@@ -100,7 +139,7 @@ def analyze_document(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="documents/{document_id}/result", methods=["GET"])
-def get_result(req: func.HttpRequest) -> func.HttpResponse:
+async def get_result(req: func.HttpRequest) -> func.HttpResponse:
     """
     GET /api/documents/{document_id}/result
     
@@ -112,18 +151,12 @@ def get_result(req: func.HttpRequest) -> func.HttpResponse:
             return error_response("Document ID required", 400)
 
         service = get_document_service()
-        result = service.get_result(document_id)
+        result = await service.get_result(document_id)
 
         if not result:
             return error_response("Result not found", 404)
 
-        return json_response({
-            "document_id": result.document_id,
-            "category_id": result.category_id,
-            "extracted_fields": result.extracted_fields,
-            "confidence": result.confidence,
-            "analyzed_at": result.analyzed_at.isoformat(),
-        })
+        return await result_response(result)
 
     except Exception as e:
         logger.exception("Get result failed")
@@ -131,7 +164,7 @@ def get_result(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="documents/{document_id}/feedback", methods=["POST"])
-def submit_feedback(req: func.HttpRequest) -> func.HttpResponse:
+async def submit_feedback(req: func.HttpRequest) -> func.HttpResponse:
     """
     POST /api/documents/{document_id}/feedback
     
@@ -149,7 +182,7 @@ def submit_feedback(req: func.HttpRequest) -> func.HttpResponse:
             return error_response("corrected_fields required", 400)
 
         service = get_document_service()
-        feedback = service.submit_feedback(
+        feedback = await service.submit_feedback(
             document_id=document_id,
             corrected_fields=corrected_fields,
             reviewer=body.get("reviewer"),
@@ -160,7 +193,7 @@ def submit_feedback(req: func.HttpRequest) -> func.HttpResponse:
         return json_response({
             "feedback_id": feedback.feedback_id,
             "document_id": feedback.document_id,
-            "created_at": feedback.created_at.isoformat(),
+            "created_at": feedback.created_at,
         }, 201)
 
     except Exception as e:
@@ -171,31 +204,23 @@ def submit_feedback(req: func.HttpRequest) -> func.HttpResponse:
 # --- Config Endpoints ---
 
 @app.route(route="config", methods=["GET"])
-def get_config(req: func.HttpRequest) -> func.HttpResponse:
+async def get_config(req: func.HttpRequest) -> func.HttpResponse:
     """
     GET /api/config
     
     Get current pipeline configuration.
     """
+    global _config_json_cache
     try:
-        config = load_config()
-        return json_response({
-            "azure": {
-                "endpoint": config.azure.endpoint,
-                "api_version": config.azure.api_version,
-                "router_analyzer_id": config.azure.router_analyzer_id,
-            },
-            "categories": [
-                {
-                    "id": c.id,
-                    "display_name": c.display_name,
-                    "analyzer_id": c.analyzer_id,
-                    "classification_prompt": c.classification_prompt,
-                    "extraction_schema": c.extraction_schema,
-                }
-                for c in config.categories
-            ],
-        })
+        config = await asyncio.to_thread(load_config)
+        if _config_json_cache is None or _config_json_cache[0] is not config:
+            body = await asyncio.to_thread(_dumps, config_to_dict(config))
+            _config_json_cache = (config, body)
+        return func.HttpResponse(
+            _config_json_cache[1],
+            status_code=200,
+            mimetype="application/json",
+        )
 
     except Exception as e:
         logger.exception("Get config failed")
@@ -203,13 +228,14 @@ def get_config(req: func.HttpRequest) -> func.HttpResponse:
 
 
 @app.route(route="config", methods=["PUT"])
-def update_config(req: func.HttpRequest) -> func.HttpResponse:
+async def update_config(req: func.HttpRequest) -> func.HttpResponse:
     """
     PUT /api/config
     
     Update pipeline configuration.
     Note: This is an admin endpoint - implement proper auth in production.
     """
+    global _config_json_cache
     try:
         body = req.get_json()
 
@@ -233,29 +259,34 @@ def update_config(req: func.HttpRequest) -> func.HttpResponse:
         ]
 
         config = PipelineConfig(azure=azure, categories=categories)
-        save_config(config)
+        # Reject what load_config would reject, before it reaches the file
+        validate_config_data(config_to_dict(config))
+        await asyncio.to_thread(save_config, config)
+        _config_json_cache = None
 
         logger.info("Configuration updated")
         return json_response({"message": "Configuration updated"})
 
     except KeyError as e:
         return error_response(f"Missing required field: {e}", 400)
+    except ConfigError as e:
+        return error_response(str(e), 400)
     except Exception as e:
         logger.exception("Update config failed")
         return error_response(str(e), 500)
 
 
 @app.route(route="config/setup-analyzers", methods=["POST"])
-def setup_analyzers(req: func.HttpRequest) -> func.HttpResponse:
+async def setup_analyzers(req: func.HttpRequest) -> func.HttpResponse:
     """
     POST /api/config/setup-analyzers
     
     Create/update all analyzers in Content Understanding based on config.
     """
     try:
-        config = load_config()
+        config = await asyncio.to_thread(load_config)
         builder = get_analyzer_builder()
-        builder.setup_all(config)
+        await builder.setup_all(config)
 
         logger.info("Analyzers setup complete")
         return json_response({
@@ -1,9 +1,11 @@
 """CLI for managing document orchestrator."""
 
 import argparse
+import asyncio
 import sys
+from itertools import islice
 
-from .config import load_config
+from .config import ConfigError, load_config
 from .factory import get_analyzer_builder
 from .settings import get_settings
 
@@ -22,6 +24,10 @@ def validate_config_cmd() -> int:
         
         print(f"Configuration valid: {len(config.categories)} categories configured")
         return 0
+    except ConfigError as e:
+        print("Configuration issues found:")
+        print(f"  - {e}")
+        return 1
     except Exception as e:
         print(f"Error: {e}")
         return 1
@@ -49,7 +55,7 @@ def setup_analyzers_cmd() -> int:
         builder = get_analyzer_builder()
 
         print(f"Setting up analyzers for {len(config.categories)} categories...")
-        builder.setup_all(config)
+        asyncio.run(builder.setup_all(config))
 
         print("Analyzers created/updated:")
         print(f"  Router: {config.azure.router_analyzer_id}")
@@ -74,8 +80,10 @@ def list_analyzers_cmd() -> int:
             print(f"  {cat.id}:")
             print(f"    Analyzer ID: {cat.analyzer_id}")
             print(f"    Display Name: {cat.display_name}")
-            fields = list(cat.extraction_schema.keys())
-            print(f"    Fields: {', '.join(fields[:5])}{'...' if len(fields) > 5 else ''}")
+            keys = iter(cat.extraction_schema)
+            first_five = ", ".join(islice(keys, 5))
+            more = next(keys, None) is not None
+            print(f"    Fields: {first_five}{'...' if more else ''}")
         
         return 0
     except Exception as e:
@@ -1,69 +1,133 @@
 """Azure Blob Storage client for document storage."""
 
 import logging
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO
 
-from azure.storage.blob import BlobServiceClient, generate_blob_sas, BlobSasPermissions
+from azure.core.exceptions import ResourceExistsError
+from azure.storage.blob import BlobSasPermissions, ContentSettings, generate_blob_sas
+from azure.storage.blob.aio import BlobServiceClient
+from cachetools import TTLCache
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_SAS_EXPIRY_HOURS = 24
+# Cached SAS URLs are dropped 5 minutes before the token itself expires
+SAS_CACHE_TTL = DEFAULT_SAS_EXPIRY_HOURS * 3600 - 300
+
 
 class BlobStorageClient:
     """Client for Azure Blob Storage operations."""
 
-    def __init__(self, connection_string: str, container_name: str):
-        self._connection_string = connection_string
+    def __init__(
+        self,
+        connection_string: str,
+        container_name: str,
+        block_size: int = 8 * 1024 * 1024,
+        max_concurrency: int = 8,
+        create_container: bool = False,
+    ):
         self._container_name = container_name
-        self._service_client = BlobServiceClient.from_connection_string(connection_string)
+        # Account credentials for SAS signing, parsed once
+        conn_parts = dict(kv.split("=", 1) for kv in connection_string.split(";") if "=" in kv)
+        self._account_name = conn_parts.get("AccountName")
+        self._account_key = conn_parts.get("AccountKey")
+        self._max_concurrency = max_concurrency
+        # Blobs above block_size are split into blocks uploaded max_concurrency at a time
+        self._service_client = BlobServiceClient.from_connection_string(
+            connection_string,
+            max_block_size=block_size,
+            max_single_put_size=block_size,
+        )
         self._container_client = self._service_client.get_container_client(container_name)
-        self._ensure_container()
+        # Skip the create round-trip entirely unless asked to provision the container
+        self._container_ready = not create_container
+        self._sas_cache: TTLCache[str, str] = TTLCache(maxsize=10_000, ttl=SAS_CACHE_TTL)
 
-    def _ensure_container(self) -> None:
-        """Create container if it doesn't exist."""
-        try:
-            self._container_client.create_container()
-            logger.info(f"Created container: {self._container_name}")
-        except Exception:
-            pass  # Container exists
+    async def _ensure_container(self) -> None:
+        """Create container if it doesn't exist (once per client)."""
+        if self._container_ready:
+            return
+        if not await self._container_client.exists():
+            try:
+                await self._container_client.create_container()
+                logger.info(f"Created container: {self._container_name}")
+            except ResourceExistsError:
+                pass  # Created concurrently
+        self._container_ready = True
 
-    def upload(self, blob_name: str, data: bytes, content_type: str) -> str:
+    async def upload(self, blob_name: str, data: bytes, content_type: str) -> str:
         """Upload blob and return URL."""
+        await self._ensure_container()
+        blob_client = self._container_client.get_blob_client(blob_name)
+        await blob_client.upload_blob(
+            data,
+            overwrite=True,
+            max_concurrency=self._max_concurrency,
+            content_settings=ContentSettings(content_type=content_type),
+        )
+        logger.info(f"Uploaded blob: {blob_name}")
+        return blob_client.url
+
+    async def upload_stream(
+        self, blob_name: str, stream: BinaryIO, content_type: str
+    ) -> str:
+        """
+        Upload a file-like object without buffering it whole and return URL.
+        
+        The SDK sizes a seekable stream itself: one Put Blob up to block_size,
+        parallel blocks above it.
+        """
+        await self._ensure_container()
         blob_client = self._container_client.get_blob_client(blob_name)
-        blob_client.upload_blob(data, overwrite=True, content_settings={"content_type": content_type})
+        await blob_client.upload_blob(
+            stream,
+            overwrite=True,
+            max_concurrency=self._max_concurrency,
+            content_settings=ContentSettings(content_type=content_type),
+        )
         logger.info(f"Uploaded blob: {blob_name}")
         return blob_client.url
 
-    def get_sas_url(self, blob_name: str, expiry_hours: int = 24) -> str:
-        """Generate SAS URL for blob access."""
-        # Parse account info from connection string
-        account_name = None
-        account_key = None
-        for part in self._connection_string.split(";"):
-            if part.startswith("AccountName="):
-                account_name = part.split("=", 1)[1]
-            elif part.startswith("AccountKey="):
-                account_key = part.split("=", 1)[1]
-
-        if not account_name or not account_key:
+    def get_sas_url(self, blob_name: str, expiry_hours: int = DEFAULT_SAS_EXPIRY_HOURS) -> str:
+        """
+        Generate SAS URL for blob access.
+        
+        URLs with the default expiry are cached and reused until shortly
+        before the token expires.
+        """
+        cacheable = expiry_hours == DEFAULT_SAS_EXPIRY_HOURS
+        if cacheable and (cached := self._sas_cache.get(blob_name)):
+            return cached
+
+        blob_url = self._container_client.get_blob_client(blob_name).url
+        if not self._account_name or not self._account_key:
             # Return direct URL if can't generate SAS
-            return self._container_client.get_blob_client(blob_name).url
+            return blob_url
 
         sas_token = generate_blob_sas(
-            account_name=account_name,
+            account_name=self._account_name,
             container_name=self._container_name,
             blob_name=blob_name,
-            account_key=account_key,
+            account_key=self._account_key,
             permission=BlobSasPermissions(read=True),
-            expiry=datetime.utcnow() + timedelta(hours=expiry_hours),
+            expiry=datetime.now(timezone.utc) + timedelta(hours=expiry_hours),
         )
-        blob_url = self._container_client.get_blob_client(blob_name).url
-        return f"{blob_url}?{sas_token}"
+        sas_url = f"{blob_url}?{sas_token}"
+        if cacheable:
+            self._sas_cache[blob_name] = sas_url
+        return sas_url
 
-    def exists(self, blob_name: str) -> bool:
+    async def exists(self, blob_name: str) -> bool:
         """Check if blob exists."""
-        return self._container_client.get_blob_client(blob_name).exists()
+        return await self._container_client.get_blob_client(blob_name).exists()
 
-    def delete(self, blob_name: str) -> None:
+    async def delete(self, blob_name: str) -> None:
         """Delete blob."""
-        self._container_client.get_blob_client(blob_name).delete_blob()
+        await self._container_client.get_blob_client(blob_name).delete_blob()
+        self._sas_cache.pop(blob_name, None)
         logger.info(f"Deleted blob: {blob_name}")
+
+    async def close(self) -> None:
+        """Close the underlying service client."""
+        await self._service_client.close()
@@ -1,7 +1,8 @@
 """Azure AI Content Understanding client."""
 
+import asyncio
 import logging
-import time
+import random
 from typing import Any
 
 import httpx
@@ -14,6 +15,17 @@ class ContentUnderstandingError(Exception):
     pass
 
 
+def _retry_after(response: httpx.Response) -> float | None:
+    """Return the Retry-After delay in seconds, if the server sent one."""
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        return None  # HTTP-date form is not used by the service
+
+
 class ContentUnderstandingClient:
     """Client for Azure AI Content Understanding API."""
 
@@ -21,7 +33,16 @@ class ContentUnderstandingClient:
         self._endpoint = endpoint.rstrip("/")
         self._api_key = api_key
         self._api_version = api_version
-        self._client = httpx.Client(timeout=120.0)
+        # One pooled HTTP/2 connection serves submits, polls and analyzer PUTs
+        self._client = httpx.AsyncClient(
+            timeout=120.0,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=100,
+                max_keepalive_connections=50,
+                keepalive_expiry=300,
+            ),
+        )
 
     def _headers(self) -> dict[str, str]:
         return {
@@ -32,77 +53,142 @@ class ContentUnderstandingClient:
     def _url(self, path: str) -> str:
         return f"{self._endpoint}/contentunderstanding{path}?api-version={self._api_version}"
 
-    def create_analyzer(self, analyzer_id: str, body: dict[str, Any]) -> None:
+    async def create_analyzer(self, analyzer_id: str, body: dict[str, Any]) -> None:
         """Create or update an analyzer."""
         url = f"{self._endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={self._api_version}"
-        response = self._client.put(url, headers=self._headers(), json=body)
+        response = await self._client.put(url, headers=self._headers(), json=body)
         if response.status_code not in (200, 201):
             raise ContentUnderstandingError(f"Failed to create analyzer: {response.text}")
         logger.info(f"Created/updated analyzer: {analyzer_id}")
 
-    def get_analyzer(self, analyzer_id: str) -> dict[str, Any] | None:
+    async def get_analyzer(self, analyzer_id: str) -> dict[str, Any] | None:
         """Get analyzer by ID."""
         url = f"{self._endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={self._api_version}"
-        response = self._client.get(url, headers=self._headers())
+        response = await self._client.get(url, headers=self._headers())
         if response.status_code == 404:
             return None
         if response.status_code != 200:
             raise ContentUnderstandingError(f"Failed to get analyzer: {response.text}")
         return response.json()
 
-    def delete_analyzer(self, analyzer_id: str) -> None:
+    async def delete_analyzer(self, analyzer_id: str) -> None:
         """Delete an analyzer."""
         url = f"{self._endpoint}/contentunderstanding/analyzers/{analyzer_id}?api-version={self._api_version}"
-        response = self._client.delete(url, headers=self._headers())
+        response = await self._client.delete(url, headers=self._headers())
         if response.status_code not in (200, 204, 404):
             raise ContentUnderstandingError(f"Failed to delete analyzer: {response.text}")
         logger.info(f"Deleted analyzer: {analyzer_id}")
 
-    def analyze(self, analyzer_id: str, document_url: str, poll_interval: float = 2.0) -> dict[str, Any]:
+    async def analyze(
+        self,
+        analyzer_id: str,
+        document_url: str,
+        initial_interval: float = 0.2,
+        max_interval: float = 10.0,
+    ) -> dict[str, Any]:
         """
         Submit document for analysis and poll until complete.
         
+        Polling starts at initial_interval and backs off exponentially (with
+        jitter) up to max_interval; a Retry-After header takes precedence.
         Returns the analysis result with classification and extracted fields.
         """
-        # Submit analysis request
-        url = f"{self._endpoint}/contentunderstanding/analyzers/{analyzer_id}:analyze?api-version={self._api_version}"
-        body = {"url": document_url}
-        
-        response = self._client.post(url, headers=self._headers(), json=body)
-        if response.status_code not in (200, 202):
-            raise ContentUnderstandingError(f"Failed to start analysis: {response.text}")
+        response = await self._submit_analysis(analyzer_id, document_url)
 
         # If synchronous response, return directly
         if response.status_code == 200:
             return response.json()
 
-        # Poll for async result
-        operation_url = response.headers.get("Operation-Location")
-        if not operation_url:
-            raise ContentUnderstandingError("No operation location in response")
+        return await self.wait_for_result(
+            self._operation_location(response),
+            initial_interval,
+            max_interval,
+            retry_after=_retry_after(response),
+        )
 
+    async def begin_analyze(
+        self, analyzer_id: str, document_url: str
+    ) -> tuple[dict[str, Any] | None, str | None]:
+        """
+        Submit document for analysis without waiting for it to finish.
+        
+        Returns (result, None) if the service answered synchronously, otherwise
+        (None, operation_url) to pass to get_operation_result/wait_for_result.
+        """
+        response = await self._submit_analysis(analyzer_id, document_url)
+        if response.status_code == 200:
+            return response.json(), None
+        return None, self._operation_location(response)
+
+    async def get_operation_result(self, operation_url: str) -> dict[str, Any] | None:
+        """Poll an analysis operation once; returns None while it is still running."""
+        result, _ = await self._poll_operation(operation_url)
+        return result
+
+    async def wait_for_result(
+        self,
+        operation_url: str,
+        initial_interval: float = 0.2,
+        max_interval: float = 10.0,
+        retry_after: float | None = None,
+    ) -> dict[str, Any]:
+        """Poll an analysis operation with backoff until it completes."""
         logger.info(f"Polling analysis operation: {operation_url}")
+        delay = initial_interval
+        wait = retry_after
         while True:
-            time.sleep(poll_interval)
-            result_response = self._client.get(operation_url, headers=self._headers())
-            if result_response.status_code != 200:
-                raise ContentUnderstandingError(f"Failed to get operation status: {result_response.text}")
-
-            result = result_response.json()
-            status = result.get("status", "").lower()
-
-            match status:
-                case "succeeded":
-                    logger.info("Analysis completed successfully")
-                    return result.get("result", result)
-                case "failed":
-                    error = result.get("error", {}).get("message", "Unknown error")
-                    raise ContentUnderstandingError(f"Analysis failed: {error}")
-                case "running" | "notstarted":
-                    continue
-                case _:
-                    raise ContentUnderstandingError(f"Unknown status: {status}")
-
-    def close(self) -> None:
+            if wait is None:
+                wait = delay * random.uniform(0.8, 1.2)
+                delay = min(delay * 1.5, max_interval)
+            await asyncio.sleep(wait)
+            result, wait = await self._poll_operation(operation_url)
+            if result is not None:
+                return result
+
+    async def _submit_analysis(self, analyzer_id: str, document_url: str) -> httpx.Response:
+        """Submit analysis request."""
+        url = f"{self._endpoint}/contentunderstanding/analyzers/{analyzer_id}:analyze?api-version={self._api_version}"
+        body = {"url": document_url}
+
+        response = await self._client.post(url, headers=self._headers(), json=body)
+        if response.status_code not in (200, 202):
+            raise ContentUnderstandingError(f"Failed to start analysis: {response.text}")
+        return response
+
+    def _operation_location(self, response: httpx.Response) -> str:
+        """Get the operation URL from an accepted analysis response."""
+        operation_url: str | None = response.headers.get("Operation-Location")
+        if not operation_url:
+            raise ContentUnderstandingError("No operation location in response")
+        return operation_url
+
+    async def _poll_operation(
+        self, operation_url: str
+    ) -> tuple[dict[str, Any] | None, float | None]:
+        """
+        Fetch operation status once.
+        
+        Returns: (result or None if still running, Retry-After seconds)
+        """
+        result_response = await self._client.get(operation_url, headers=self._headers())
+        if result_response.status_code != 200:
+            raise ContentUnderstandingError(f"Failed to get operation status: {result_response.text}")
+
+        result = result_response.json()
+        status = result.get("status", "").lower()
+
+        match status:
+            case "succeeded":
+                logger.info("Analysis completed successfully")
+                return result.get("result", result), None
+            case "failed":
+                error = result.get("error", {}).get("message", "Unknown error")
+                raise ContentUnderstandingError(f"Analysis failed: {error}")
+            case "running" | "notstarted":
+                return None, _retry_after(result_response)
+            case _:
+                raise ContentUnderstandingError(f"Unknown status: {status}")
+
+    async def close(self) -> None:
         """Close the HTTP client."""
-        self._client.close()
+        await self._client.aclose()
@@ -1,12 +1,20 @@
 """Configuration loading and management."""
 
 import os
-from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
+import fastjsonschema
+import orjson
 import yaml
 
+try:
+    from yaml import CSafeDumper as _YamlDumper
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeDumper as _YamlDumper
+    from yaml import SafeLoader as _YamlLoader
+
 from .models import AzureSettings, Category, PipelineConfig
 
 
@@ -15,6 +23,64 @@ class ConfigError(Exception):
     pass
 
 
+# JSON Schema for the raw pipeline config (YAML or JSON)
+PIPELINE_SCHEMA: dict[str, Any] = {
+    "type": "object",
+    "properties": {
+        "azure": {
+            "type": "object",
+            "properties": {
+                "endpoint": {"type": "string"},
+                "api_version": {"type": "string"},
+                "router_analyzer_id": {"type": "string", "pattern": "^[A-Za-z0-9._-]{1,64}$"},
+            },
+        },
+        "categories": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "required": ["id", "display_name", "analyzer_id"],
+                "properties": {
+                    "id": {"type": "string", "minLength": 1},
+                    "display_name": {"type": "string", "minLength": 1},
+                    "analyzer_id": {"type": "string", "pattern": "^[A-Za-z0-9._-]{1,64}$"},
+                    "classification_prompt": {"type": "string"},
+                    "extraction_schema": {
+                        "type": "object",
+                        "additionalProperties": {"$ref": "#/definitions/field"},
+                    },
+                },
+            },
+        },
+    },
+    "definitions": {
+        "field": {
+            "type": "object",
+            "properties": {
+                "type": {
+                    "enum": [
+                        "string", "number", "integer", "boolean",
+                        "date", "time", "object", "array",
+                    ],
+                },
+                "description": {"type": "string"},
+                "properties": {
+                    "type": "object",
+                    "additionalProperties": {"$ref": "#/definitions/field"},
+                },
+                "items": {"$ref": "#/definitions/field"},
+            },
+        },
+    },
+}
+
+# Compiled once at import; fastjsonschema generates a dedicated validator function
+_validate = fastjsonschema.compile(PIPELINE_SCHEMA)
+
+# Last parsed config, keyed by file path and modification time
+_cache: tuple[Path, int, PipelineConfig] | None = None
+
+
 def _get_config_path() -> Path:
     """Get config file path from environment or default."""
     env_path = os.getenv("CONFIG_FILE_PATH", "config/pipeline.yaml")
@@ -47,31 +113,58 @@ def _parse_config(data: dict[str, Any]) -> PipelineConfig:
     return PipelineConfig(azure=azure, categories=categories)
 
 
-@lru_cache(maxsize=1)
+def validate_config_data(data: Any) -> None:
+    """Check raw config data against PIPELINE_SCHEMA, raising ConfigError."""
+    try:
+        _validate(data)
+    except fastjsonschema.JsonSchemaValueException as e:
+        raise ConfigError(f"Invalid config: {e.message}") from e
+
+
 def load_config() -> PipelineConfig:
-    """Load and cache pipeline configuration."""
+    """
+    Load pipeline configuration.
+    
+    The parsed config is cached until the file's mtime changes, so edits
+    (including those made by save_config) are picked up automatically.
+    """
+    global _cache
     path = _get_config_path()
-    if not path.exists():
-        raise ConfigError(f"Config file not found: {path}")
+    try:
+        mtime = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        raise ConfigError(f"Config file not found: {path}") from None
+
+    if _cache and _cache[0] == path and _cache[1] == mtime:
+        return _cache[2]
 
     try:
-        with open(path, encoding="utf-8") as f:
-            data = yaml.safe_load(f)
-        return _parse_config(data)
+        if path.suffix == ".json":
+            data = orjson.loads(path.read_bytes())
+        else:
+            with open(path, encoding="utf-8") as f:
+                data = yaml.load(f, Loader=_YamlLoader)
+        validate_config_data(data)
+        config = _parse_config(data)
+    except orjson.JSONDecodeError as e:
+        raise ConfigError(f"Invalid JSON: {e}") from e
     except yaml.YAMLError as e:
         raise ConfigError(f"Invalid YAML: {e}") from e
 
+    _cache = (path, mtime, config)
+    return config
+
 
 def reload_config() -> PipelineConfig:
     """Clear cache and reload configuration."""
-    load_config.cache_clear()
+    global _cache
+    _cache = None
     return load_config()
 
 
-def save_config(config: PipelineConfig) -> None:
-    """Save configuration to YAML file."""
-    path = _get_config_path()
-    data = {
+def config_to_dict(config: PipelineConfig) -> dict[str, Any]:
+    """Convert PipelineConfig to its file/API representation."""
+    return {
         "azure": {
             "endpoint": config.azure.endpoint,
             "api_version": config.azure.api_version,
@@ -88,6 +181,14 @@ def save_config(config: PipelineConfig) -> None:
             for c in config.categories
         ],
     }
+
+
+def save_config(config: PipelineConfig) -> None:
+    """Save configuration to the config file (JSON if it has a .json suffix, else YAML)."""
+    path = _get_config_path()
+    data = config_to_dict(config)
+    if path.suffix == ".json":
+        path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        return
     with open(path, "w", encoding="utf-8") as f:
-        yaml.dump(data, f, default_flow_style=False, sort_keys=False)
-    load_config.cache_clear()
+        yaml.dump(data, f, Dumper=_YamlDumper, default_flow_style=False, sort_keys=False)
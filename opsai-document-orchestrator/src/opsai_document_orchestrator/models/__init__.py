@@ -1,8 +1,17 @@
 """Domain models for the document orchestrator."""
 
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any
+
+import orjson
+
+_MISSING = object()
+
+
+def _utcnow() -> datetime:
+    """Current time as an aware UTC datetime."""
+    return datetime.now(timezone.utc)
 
 
 @dataclass(slots=True)
@@ -28,14 +37,24 @@ class PipelineConfig:
     """Complete pipeline configuration."""
     azure: AzureSettings
     categories: list[Category]
+    _by_id: dict[str, Category] = field(init=False, repr=False, compare=False)
+    _by_analyzer: dict[str, Category] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # Lookup indexes; first match wins, as with a linear scan
+        self._by_id = {}
+        self._by_analyzer = {}
+        for c in self.categories:
+            self._by_id.setdefault(c.id, c)
+            self._by_analyzer.setdefault(c.analyzer_id, c)
 
     def get_category(self, category_id: str) -> Category | None:
         """Find category by ID."""
-        return next((c for c in self.categories if c.id == category_id), None)
+        return self._by_id.get(category_id)
 
     def get_category_by_analyzer(self, analyzer_id: str) -> Category | None:
         """Find category by analyzer ID."""
-        return next((c for c in self.categories if c.analyzer_id == analyzer_id), None)
+        return self._by_analyzer.get(analyzer_id)
 
 
 @dataclass(slots=True)
@@ -45,17 +64,74 @@ class DocumentRecord:
     blob_url: str
     filename: str
     content_type: str
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
 
 
-@dataclass(slots=True)
+@dataclass
 class AnalysisResult:
-    """Document analysis result."""
+    """
+    Document analysis result.
+    
+    Results loaded from storage (from_raw_fields) keep extracted_fields as
+    the stored JSON and decode it on first access; until then the JSON can
+    be written back as-is. Not slotted, so the undecoded JSON can sit in the
+    instance dict without being a dataclass field.
+    """
     document_id: str
     category_id: str | None
     extracted_fields: dict[str, Any]
     confidence: float | None = None
-    analyzed_at: datetime = field(default_factory=datetime.utcnow)
+    analyzed_at: datetime = field(default_factory=_utcnow)
+
+    @classmethod
+    def from_raw_fields(
+        cls,
+        document_id: str,
+        category_id: str | None,
+        raw_fields_json: str | None,
+        confidence: float | None,
+        analyzed_at: datetime,
+    ) -> "AnalysisResult":
+        """Create result whose extracted_fields are decoded from JSON on demand."""
+        result = cls.__new__(cls)
+        result.__dict__.update(
+            document_id=document_id,
+            category_id=category_id,
+            confidence=confidence,
+            analyzed_at=analyzed_at,
+            _raw_fields_json=raw_fields_json,
+        )
+        return result
+
+    @property
+    def raw_fields_json(self) -> str | None:
+        """Stored JSON for extracted_fields, if it has not been decoded yet."""
+        state = self.__dict__
+        return None if "extracted_fields" in state else state.get("_raw_fields_json")
+
+    if not TYPE_CHECKING:
+        # Hidden from type checkers so other attribute typos still get flagged
+
+        def __getattr__(self, name: str) -> Any:
+            # Only reached while extracted_fields has not been set on the instance
+            state = self.__dict__
+            raw = state.get("_raw_fields_json", _MISSING) if name == "extracted_fields" else _MISSING
+            if raw is _MISSING:
+                if name in state:  # Decoded concurrently
+                    return state[name]
+                raise AttributeError(f"{type(self).__name__!r} object has no attribute {name!r}")
+            state.setdefault(name, orjson.loads(raw) if raw else {})
+            state.pop("_raw_fields_json", None)
+            return state[name]
+
+
+@dataclass(slots=True)
+class AnalysisSummary:
+    """Analysis result metadata, without the extracted fields."""
+    document_id: str
+    category_id: str | None
+    confidence: float | None
+    analyzed_at: datetime
 
 
 @dataclass(slots=True)
@@ -66,4 +142,13 @@ class FeedbackRecord:
     corrected_fields: dict[str, Any]
     reviewer: str | None = None
     comment: str | None = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=_utcnow)
+
+
+@dataclass(slots=True)
+class FeedbackSummary:
+    """Feedback metadata, without the corrected fields."""
+    feedback_id: str
+    document_id: str
+    reviewer: str | None
+    created_at: datetime
@@ -1,34 +1,109 @@
 """Azure Table Storage repository implementations."""
 
-import json
 import logging
-from datetime import datetime
-from typing import Any
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from functools import cache
+from itertools import islice
+from typing import Any, Literal, overload
+
+import orjson
+import requests
+from azure.core.exceptions import ResourceExistsError, ResourceNotFoundError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.data.tables import TableClient, TableServiceClient
+from cachetools import TTLCache
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from ..models import AnalysisResult, AnalysisSummary, FeedbackRecord, FeedbackSummary
 
-from azure.data.tables import TableServiceClient, TableClient
-from azure.core.exceptions import ResourceNotFoundError
+logger = logging.getLogger(__name__)
 
-from ..models import AnalysisResult, FeedbackRecord
+# (account, table) pairs known to exist, so create_table runs once per process
+_ENSURED_TABLES: set[tuple[str | None, str]] = set()
+_ENSURED_TABLES_LOCK = threading.Lock()
+
+# Azure Tables caps a batch transaction at 100 entities, all in one partition
+MAX_BATCH_SIZE = 100
+
+# Pooled connections per storage account; the requests default of 10 serializes
+# concurrent repository calls made from worker threads
+TABLE_POOL_SIZE = 20
 
-logger = logging.getLogger(__name__)
+
+@cache
+def _get_service_client(connection_string: str) -> TableServiceClient:
+    """Get a TableServiceClient shared by all repositories on this account."""
+    session = requests.Session()
+    # Same as the SDK's own adapter: retries are left to the pipeline's retry policy
+    adapter = HTTPAdapter(
+        pool_connections=TABLE_POOL_SIZE,
+        pool_maxsize=TABLE_POOL_SIZE,
+        max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    transport = RequestsTransport(session=session, session_owner=False)
+    return TableServiceClient.from_connection_string(connection_string, transport=transport)
 
 
 class TableRepository:
     """Base repository for Azure Table Storage."""
 
-    def __init__(self, connection_string: str, table_name: str):
+    PARTITION_KEY = ""
+    # OData filters are fixed strings; values are bound as query parameters,
+    # which the SDK quotes and escapes
+    PARTITION_FILTER = "PartitionKey eq @pk"
+
+    def __init__(self, connection_string: str, table_name: str, ensure_table: bool = True):
         self._table_name = table_name
-        service_client = TableServiceClient.from_connection_string(connection_string)
+        service_client = _get_service_client(connection_string)
         self._table_client: TableClient = service_client.get_table_client(table_name)
-        self._ensure_table()
+        if ensure_table:
+            self._ensure_table()
 
     def _ensure_table(self) -> None:
-        """Create table if it doesn't exist."""
-        try:
-            self._table_client.create_table()
-            logger.info(f"Created table: {self._table_name}")
-        except Exception:
-            pass  # Table exists
+        """Create table if it doesn't exist (at most once per process)."""
+        key = (self._table_client.account_name, self._table_name)
+        with _ENSURED_TABLES_LOCK:
+            if key in _ENSURED_TABLES:
+                return
+            try:
+                self._table_client.create_table()
+                logger.info(f"Created table: {self._table_name}")
+            except ResourceExistsError:
+                pass  # Table exists
+            except Exception:
+                logger.warning(f"Could not ensure table: {self._table_name}", exc_info=True)
+                return  # Retry on next instantiation
+            _ENSURED_TABLES.add(key)
+
+    @staticmethod
+    def _dumps(value: Any) -> str:
+        """Serialize a JSON column value (Table Storage stores it as a string)."""
+        return orjson.dumps(value).decode()
+
+    @staticmethod
+    def _loads(value: str | bytes | None) -> Any:
+        """Deserialize a JSON column value; missing/empty columns become {}."""
+        return orjson.loads(value) if value else {}
+
+    @staticmethod
+    def _parse_datetime(value: datetime | str | None) -> datetime:
+        """
+        Read a timestamp column; missing values default to now.
+        
+        Timestamps are stored as Edm.DateTime and come back as datetimes;
+        ISO strings are only found on rows written by older versions.
+        Naive values are taken to be UTC, which is what every writer used.
+        """
+        if value is None:
+            return datetime.now(timezone.utc)
+        if not isinstance(value, datetime):
+            value = datetime.fromisoformat(value)
+        return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
 
     def _get_entity(self, partition_key: str, row_key: str) -> dict[str, Any] | None:
         """Get entity from table."""
@@ -41,6 +116,19 @@ class TableRepository:
         """Insert or update entity."""
         self._table_client.upsert_entity(entity)
 
+    def _upsert_many(self, entities: Iterable[dict[str, Any]]) -> int:
+        """
+        Upsert entities in batch transactions of up to MAX_BATCH_SIZE.
+        
+        Entities must share a partition key. Returns the number written.
+        """
+        entities = iter(entities)
+        written = 0
+        while operations := [("upsert", e) for e in islice(entities, MAX_BATCH_SIZE)]:
+            self._table_client.submit_transaction(operations)
+            written += len(operations)
+        return written
+
     def _delete_entity(self, partition_key: str, row_key: str) -> None:
         """Delete entity from table."""
         try:
@@ -48,47 +136,164 @@ class TableRepository:
         except ResourceNotFoundError:
             pass
 
-    def _query(self, filter_expr: str | None = None) -> list[dict[str, Any]]:
-        """Query entities."""
+    def _iter_query(
+        self,
+        filter_expr: str | None = None,
+        select: list[str] | None = None,
+        **parameters: Any,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Stream entities page by page, optionally fetching only the selected columns.
+        
+        @pk in filter_expr is bound to PARTITION_KEY; other @names are bound
+        from keyword arguments.
+        """
         if filter_expr:
-            return list(self._table_client.query_entities(filter_expr))
-        return list(self._table_client.list_entities())
+            yield from self._table_client.query_entities(
+                filter_expr,
+                parameters={"pk": self.PARTITION_KEY, **parameters},
+                select=select,
+            )
+        else:
+            yield from self._table_client.list_entities(select=select)
 
 
 class DocumentRepository(TableRepository):
     """Repository for document analysis results."""
 
     PARTITION_KEY = "documents"
+    SUMMARY_COLUMNS = ["RowKey", "category_id", "confidence", "analyzed_at"]
+    CATEGORY_FILTER = "PartitionKey eq @pk and category_id eq @category_id"
+
+    def __init__(
+        self,
+        connection_string: str,
+        table_name: str,
+        ensure_table: bool = True,
+        cache_size: int = 1024,
+        cache_ttl: float = 60.0,
+    ):
+        super().__init__(connection_string, table_name, ensure_table)
+        # Recently read results; misses are not cached so new results show up at once
+        self._cache: TTLCache[str, AnalysisResult] = TTLCache(maxsize=cache_size, ttl=cache_ttl)
+        self._cache_lock = threading.Lock()
 
     def get(self, document_id: str) -> AnalysisResult | None:
         """Get analysis result by document ID."""
+        with self._cache_lock:
+            if (cached := self._cache.get(document_id)) is not None:
+                return cached
+
         entity = self._get_entity(self.PARTITION_KEY, document_id)
         if not entity:
             return None
-        return self._to_model(entity)
+        result = self._to_model(entity)
+        with self._cache_lock:
+            self._cache[document_id] = result
+        return result
 
     def save(self, result: AnalysisResult) -> None:
         """Save analysis result."""
         entity = self._to_entity(result)
         self._upsert_entity(entity)
+        self._invalidate(result.document_id)
         logger.info(f"Saved analysis result: {result.document_id}")
 
+    def save_many(self, results: Iterable[AnalysisResult]) -> None:
+        """Save analysis results in batch transactions."""
+        document_ids: list[str] = []
+
+        def entities() -> Iterator[dict[str, Any]]:
+            for result in results:
+                document_ids.append(result.document_id)
+                yield self._to_entity(result)
+
+        try:
+            count = self._upsert_many(entities())
+        finally:
+            # A failed batch may follow committed ones; drop every attempted id
+            for document_id in document_ids:
+                self._invalidate(document_id)
+        logger.info(f"Saved {count} analysis results")
+
     def delete(self, document_id: str) -> None:
         """Delete analysis result."""
         self._delete_entity(self.PARTITION_KEY, document_id)
+        self._invalidate(document_id)
         logger.info(f"Deleted analysis result: {document_id}")
 
+    def iter_all(self) -> Iterator[AnalysisResult]:
+        """Stream all analysis results."""
+        return map(self._to_model, self._iter_query(self.PARTITION_FILTER))
+
+    @overload
+    def iter_by_category(
+        self, category_id: str, fields_only: Literal[False] = ...
+    ) -> Iterator[AnalysisResult]: ...
+
+    @overload
+    def iter_by_category(
+        self, category_id: str, fields_only: Literal[True]
+    ) -> Iterator[AnalysisSummary]: ...
+
+    @overload
+    def iter_by_category(
+        self, category_id: str, fields_only: bool = ...
+    ) -> Iterator[AnalysisResult] | Iterator[AnalysisSummary]: ...
+
+    def iter_by_category(
+        self, category_id: str, fields_only: bool = False
+    ) -> Iterator[AnalysisResult] | Iterator[AnalysisSummary]:
+        """
+        Stream results by category.
+        
+        With fields_only, only metadata columns are fetched (server-side
+        $select) and AnalysisSummary objects are yielded.
+        """
+        if fields_only:
+            entities = self._iter_query(
+                self.CATEGORY_FILTER, select=self.SUMMARY_COLUMNS, category_id=category_id
+            )
+            return map(self._to_summary, entities)
+        entities = self._iter_query(self.CATEGORY_FILTER, category_id=category_id)
+        return map(self._to_model, entities)
+
     def list_all(self) -> list[AnalysisResult]:
         """List all analysis results."""
-        entities = self._query(f"PartitionKey eq '{self.PARTITION_KEY}'")
-        return [self._to_model(e) for e in entities]
-
-    def list_by_category(self, category_id: str) -> list[AnalysisResult]:
-        """List results by category."""
-        entities = self._query(
-            f"PartitionKey eq '{self.PARTITION_KEY}' and category_id eq '{category_id}'"
-        )
-        return [self._to_model(e) for e in entities]
+        return list(self.iter_all())
+
+    @overload
+    def list_by_category(
+        self, category_id: str, fields_only: Literal[False] = ...
+    ) -> list[AnalysisResult]: ...
+
+    @overload
+    def list_by_category(
+        self, category_id: str, fields_only: Literal[True]
+    ) -> list[AnalysisSummary]: ...
+
+    @overload
+    def list_by_category(
+        self, category_id: str, fields_only: bool = ...
+    ) -> list[AnalysisResult] | list[AnalysisSummary]: ...
+
+    def list_by_category(
+        self, category_id: str, fields_only: bool = False
+    ) -> list[AnalysisResult] | list[AnalysisSummary]:
+        """List results by category (see iter_by_category)."""
+        if fields_only:
+            return list(self.iter_by_category(category_id, fields_only=True))
+        return list(self.iter_by_category(category_id))
+
+    def clear_cache(self) -> None:
+        """Drop all cached results."""
+        with self._cache_lock:
+            self._cache.clear()
+
+    def _invalidate(self, document_id: str) -> None:
+        """Drop a cached result."""
+        with self._cache_lock:
+            self._cache.pop(document_id, None)
 
     def _to_entity(self, result: AnalysisResult) -> dict[str, Any]:
         """Convert model to table entity."""
@@ -96,25 +301,36 @@ class DocumentRepository(TableRepository):
             "PartitionKey": self.PARTITION_KEY,
             "RowKey": result.document_id,
             "category_id": result.category_id or "",
-            "extracted_fields": json.dumps(result.extracted_fields),
+            "extracted_fields": self._fields_json(result),
             "confidence": result.confidence,
-            "analyzed_at": result.analyzed_at.isoformat(),
+            "analyzed_at": result.analyzed_at,
         }
 
     def _to_model(self, entity: dict[str, Any]) -> AnalysisResult:
         """Convert table entity to model."""
-        analyzed_at = entity.get("analyzed_at")
-        if isinstance(analyzed_at, str):
-            analyzed_at = datetime.fromisoformat(analyzed_at)
-        elif analyzed_at is None:
-            analyzed_at = datetime.utcnow()
+        get = entity.get
+        # extracted_fields is decoded only if a caller reads it
+        return AnalysisResult.from_raw_fields(
+            document_id=entity["RowKey"],
+            category_id=get("category_id") or None,
+            raw_fields_json=get("extracted_fields"),
+            confidence=get("confidence"),
+            analyzed_at=self._parse_datetime(get("analyzed_at")),
+        )
+
+    def _fields_json(self, result: AnalysisResult) -> str:
+        """Encode extracted_fields, reusing the stored JSON if it was never decoded."""
+        raw = result.raw_fields_json
+        return self._dumps(result.extracted_fields) if raw is None else raw
 
-        return AnalysisResult(
+    def _to_summary(self, entity: dict[str, Any]) -> AnalysisSummary:
+        """Convert projected table entity to summary."""
+        get = entity.get
+        return AnalysisSummary(
             document_id=entity["RowKey"],
-            category_id=entity.get("category_id") or None,
-            extracted_fields=json.loads(entity.get("extracted_fields", "{}")),
-            confidence=entity.get("confidence"),
-            analyzed_at=analyzed_at,
+            category_id=get("category_id") or None,
+            confidence=get("confidence"),
+            analyzed_at=self._parse_datetime(get("analyzed_at")),
         )
 
 
@@ -122,6 +338,8 @@ class FeedbackRepository(TableRepository):
     """Repository for feedback records."""
 
     PARTITION_KEY = "feedback"
+    SUMMARY_COLUMNS = ["RowKey", "document_id", "reviewer", "created_at"]
+    DOCUMENT_FILTER = "PartitionKey eq @pk and document_id eq @document_id"
 
     def get(self, feedback_id: str) -> FeedbackRecord | None:
         """Get feedback by ID."""
@@ -130,12 +348,37 @@ class FeedbackRepository(TableRepository):
             return None
         return self._to_model(entity)
 
-    def get_by_document(self, document_id: str) -> list[FeedbackRecord]:
-        """Get all feedback for a document."""
-        entities = self._query(
-            f"PartitionKey eq '{self.PARTITION_KEY}' and document_id eq '{document_id}'"
-        )
-        return [self._to_model(e) for e in entities]
+    @overload
+    def get_by_document(
+        self, document_id: str, fields_only: Literal[False] = ...
+    ) -> list[FeedbackRecord]: ...
+
+    @overload
+    def get_by_document(
+        self, document_id: str, fields_only: Literal[True]
+    ) -> list[FeedbackSummary]: ...
+
+    @overload
+    def get_by_document(
+        self, document_id: str, fields_only: bool = ...
+    ) -> list[FeedbackRecord] | list[FeedbackSummary]: ...
+
+    def get_by_document(
+        self, document_id: str, fields_only: bool = False
+    ) -> list[FeedbackRecord] | list[FeedbackSummary]:
+        """
+        Get all feedback for a document.
+        
+        With fields_only, only metadata columns are fetched (server-side
+        $select) and FeedbackSummary objects are returned.
+        """
+        if fields_only:
+            entities = self._iter_query(
+                self.DOCUMENT_FILTER, select=self.SUMMARY_COLUMNS, document_id=document_id
+            )
+            return list(map(self._to_summary, entities))
+        entities = self._iter_query(self.DOCUMENT_FILTER, document_id=document_id)
+        return list(map(self._to_model, entities))
 
     def save(self, feedback: FeedbackRecord) -> None:
         """Save feedback record."""
@@ -143,15 +386,23 @@ class FeedbackRepository(TableRepository):
         self._upsert_entity(entity)
         logger.info(f"Saved feedback: {feedback.feedback_id}")
 
+    def save_many(self, feedback: Iterable[FeedbackRecord]) -> None:
+        """Save feedback records in batch transactions."""
+        count = self._upsert_many(self._to_entity(f) for f in feedback)
+        logger.info(f"Saved {count} feedback records")
+
     def delete(self, feedback_id: str) -> None:
         """Delete feedback record."""
         self._delete_entity(self.PARTITION_KEY, feedback_id)
         logger.info(f"Deleted feedback: {feedback_id}")
 
+    def iter_all(self) -> Iterator[FeedbackRecord]:
+        """Stream all feedback records."""
+        return map(self._to_model, self._iter_query(self.PARTITION_FILTER))
+
     def list_all(self) -> list[FeedbackRecord]:
         """List all feedback records."""
-        entities = self._query(f"PartitionKey eq '{self.PARTITION_KEY}'")
-        return [self._to_model(e) for e in entities]
+        return list(self.iter_all())
 
     def _to_entity(self, feedback: FeedbackRecord) -> dict[str, Any]:
         """Convert model to table entity."""
@@ -159,25 +410,30 @@ class FeedbackRepository(TableRepository):
             "PartitionKey": self.PARTITION_KEY,
             "RowKey": feedback.feedback_id,
             "document_id": feedback.document_id,
-            "corrected_fields": json.dumps(feedback.corrected_fields),
+            "corrected_fields": self._dumps(feedback.corrected_fields),
             "reviewer": feedback.reviewer or "",
             "comment": feedback.comment or "",
-            "created_at": feedback.created_at.isoformat(),
+            "created_at": feedback.created_at,
         }
 
     def _to_model(self, entity: dict[str, Any]) -> FeedbackRecord:
         """Convert table entity to model."""
-        created_at = entity.get("created_at")
-        if isinstance(created_at, str):
-            created_at = datetime.fromisoformat(created_at)
-        elif created_at is None:
-            created_at = datetime.utcnow()
-
+        get = entity.get
         return FeedbackRecord(
             feedback_id=entity["RowKey"],
-            document_id=entity.get("document_id", ""),
-            corrected_fields=json.loads(entity.get("corrected_fields", "{}")),
-            reviewer=entity.get("reviewer") or None,
-            comment=entity.get("comment") or None,
-            created_at=created_at,
+            document_id=get("document_id", ""),
+            corrected_fields=self._loads(get("corrected_fields")),
+            reviewer=get("reviewer") or None,
+            comment=get("comment") or None,
+            created_at=self._parse_datetime(get("created_at")),
+        )
+
+    def _to_summary(self, entity: dict[str, Any]) -> FeedbackSummary:
+        """Convert projected table entity to summary."""
+        get = entity.get
+        return FeedbackSummary(
+            feedback_id=entity["RowKey"],
+            document_id=get("document_id", ""),
+            reviewer=get("reviewer") or None,
+            created_at=self._parse_datetime(get("created_at")),
         )
@@ -1,27 +1,61 @@
 """Builder for Azure Content Understanding analyzers."""
 
+import asyncio
 import logging
+import sys
+from collections.abc import Mapping
 from typing import Any
 
+import orjson
+
 from ..clients import ContentUnderstandingClient
 from ..models import Category, PipelineConfig
 
 logger = logging.getLogger(__name__)
 
+# Default bound on concurrent analyzer PUTs, to stay under service throttling limits
+MAX_CONCURRENT_SETUPS = 10
+
+# Bound on cached analyzer bodies; reached only if categories churn heavily
+MAX_CACHED_BODIES = 256
+
+
+# Key holding a field's children, by field type; any other type converts as a leaf
+_CHILD_KEYS = {"object": "properties", "array": "items"}
+
 
 class AnalyzerBuilder:
     """Builds and manages Content Understanding analyzers from configuration."""
 
-    def __init__(self, client: ContentUnderstandingClient):
+    def __init__(
+        self, client: ContentUnderstandingClient, max_concurrency: int = MAX_CONCURRENT_SETUPS
+    ):
         self._client = client
+        # Must stay within the client's connection pool (100) to actually overlap
+        self._max_concurrency = max_concurrency
+        self._body_cache: dict[tuple[str, bytes], dict[str, Any]] = {}
 
     def build_category_analyzer(self, category: Category) -> dict[str, Any]:
-        """Build analyzer definition for a category."""
-        return {
-            "description": f"Extractor for {category.display_name}",
-            "baseAnalyzerId": "prebuilt-document",
-            "fieldSchema": self._convert_schema(category.extraction_schema),
-        }
+        """
+        Build analyzer definition for a category.
+        
+        Bodies are cached by display name and canonical schema JSON, so
+        re-running setup for unchanged categories skips schema conversion.
+        The returned dict is shared and must not be mutated.
+        """
+        key = (
+            category.display_name,
+            orjson.dumps(category.extraction_schema, option=orjson.OPT_SORT_KEYS),
+        )
+        if (body := self._body_cache.get(key)) is None:
+            if len(self._body_cache) >= MAX_CACHED_BODIES:
+                self._body_cache.clear()
+            body = self._body_cache[key] = {
+                "description": f"Extractor for {category.display_name}",
+                "baseAnalyzerId": "prebuilt-document",
+                "fieldSchema": self._convert_schema(category.extraction_schema),
+            }
+        return body
 
     def build_router_analyzer(self, config: PipelineConfig) -> dict[str, Any]:
         """Build router analyzer definition with content categories."""
@@ -43,20 +77,25 @@ class AnalyzerBuilder:
             },
         }
 
-    def setup_all(self, config: PipelineConfig) -> None:
+    async def setup_all(self, config: PipelineConfig) -> None:
         """Create/update all analyzers from configuration."""
-        # Create per-category analyzers
-        for category in config.categories:
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        async def setup_category(category: Category) -> None:
             body = self.build_category_analyzer(category)
-            self._client.create_analyzer(category.analyzer_id, body)
+            async with semaphore:
+                await self._client.create_analyzer(category.analyzer_id, body)
             logger.info(f"Setup analyzer: {category.analyzer_id}")
 
+        # Create per-category analyzers concurrently
+        await asyncio.gather(*(setup_category(c) for c in config.categories))
+
         # Create router analyzer
         router_body = self.build_router_analyzer(config)
-        self._client.create_analyzer(config.azure.router_analyzer_id, router_body)
+        await self._client.create_analyzer(config.azure.router_analyzer_id, router_body)
         logger.info(f"Setup router: {config.azure.router_analyzer_id}")
 
-    def _convert_schema(self, schema: dict[str, Any]) -> dict[str, Any]:
+    def _convert_schema(self, schema: Mapping[str, Any]) -> dict[str, Any]:
         """
         Convert extraction schema to Content Understanding fieldSchema format.
         
@@ -79,27 +118,35 @@ class AnalyzerBuilder:
                 "items": {...}        # for arrays
             }
         }
+        
+        Walks nested properties and array items with an explicit stack
+        instead of recursing per field.
         """
-        result = {}
-        for name, field in schema.items():
-            result[name] = self._convert_field(field)
-        return result
-
-    def _convert_field(self, field: dict[str, Any]) -> dict[str, Any]:
-        """Convert a single field definition."""
-        converted: dict[str, Any] = {"type": field.get("type", "string")}
+        result: dict[str, Any] = {}
+        # (output dict, field definitions to convert into it)
+        stack: list[tuple[dict[str, Any], Mapping[str, Any]]] = [(result, schema)]
+        while stack:
+            out, fields = stack.pop()
+            for name, field in fields.items():
+                # Few distinct type names, repeated across every field
+                field_type = sys.intern(field.get("type", "string"))
+                converted = out[name] = {"type": field_type}
+
+                if description := field.get("description"):
+                    converted["description"] = description
+
+                child_key = _CHILD_KEYS.get(field_type)
+                if child_key is None or (children := field.get(child_key)) is None:
+                    continue
+
+                # Handle nested object properties
+                if child_key == "properties":
+                    child: dict[str, Any] = {}
+                    converted["properties"] = child
+                    stack.append((child, children))
+
+                # Handle array items (converted as the single field "items")
+                else:
+                    stack.append((converted, {"items": children}))
 
-        if description := field.get("description"):
-            converted["description"] = description
-
-        # Handle nested object properties
-        if field.get("type") == "object" and "properties" in field:
-            converted["properties"] = {
-                k: self._convert_field(v) for k, v in field["properties"].items()
-            }
-
-        # Handle array items
-        if field.get("type") == "array" and "items" in field:
-            converted["items"] = self._convert_field(field["items"])
-
-        return converted
+        return result
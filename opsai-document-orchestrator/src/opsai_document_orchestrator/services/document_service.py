@@ -1,9 +1,12 @@
 """Document processing service - core business logic."""
 
+import asyncio
 import logging
 import uuid
-from datetime import datetime
-from typing import Any
+from collections.abc import Iterable
+from datetime import datetime, timezone
+from typing import Any, BinaryIO
+from urllib.parse import urlsplit
 
 from ..clients import BlobStorageClient, ContentUnderstandingClient
 from ..config import load_config
@@ -12,12 +15,18 @@ from ..repositories import DocumentRepository, FeedbackRepository
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on in-flight Content Understanding calls during bulk analysis
+MAX_CONCURRENT_ANALYSES = 10
+
 
 class DocumentService:
     """
     Orchestrates document upload, analysis, and feedback operations.
     
     Single responsibility: coordinate between storage, analysis, and persistence.
+    Blob and Content Understanding calls are awaited directly; the Table Storage
+    repositories are synchronous and run in a worker thread so they don't block
+    the event loop.
     """
 
     def __init__(
@@ -32,25 +41,35 @@ class DocumentService:
         self._cu = cu_client
         self._docs = doc_repo
         self._feedback = feedback_repo
-        self._config = config or load_config()
+        self._config = config
+
+    async def _current_config(self) -> PipelineConfig:
+        """
+        Injected config, or the current file config (re-read when it changes).
+        
+        A file re-parse runs off the event loop.
+        """
+        if self._config is not None:
+            return self._config
+        return await asyncio.to_thread(load_config)
 
-    def upload_document(
-        self, filename: str, content: bytes, content_type: str
+    async def upload_document(
+        self, filename: str, stream: BinaryIO, content_type: str
     ) -> tuple[str, str]:
         """
-        Upload document to blob storage.
+        Stream document to blob storage.
         
         Returns: (document_id, blob_url)
         """
-        document_id = str(uuid.uuid4())
+        document_id = uuid.uuid4().hex
         blob_name = f"{document_id}/{filename}"
         
-        blob_url = self._blob.upload(blob_name, content, content_type)
+        blob_url = await self._blob.upload_stream(blob_name, stream, content_type)
         logger.info(f"Uploaded document: {document_id}")
         
         return document_id, blob_url
 
-    def analyze_document(self, document_id: str, blob_url: str) -> AnalysisResult:
+    async def analyze_document(self, document_id: str, blob_url: str) -> AnalysisResult:
         """
         Analyze document using Content Understanding router.
         
@@ -58,36 +77,72 @@ class DocumentService:
         2. Call router analyzer
         3. Parse and store results
         """
+        config = await self._current_config()
+        result = await self._run_analysis(config, document_id, blob_url)
+        await asyncio.to_thread(self._docs.save, result)
+        return result
+
+    async def bulk_analyze(
+        self, documents: Iterable[tuple[str, str]]
+    ) -> list[AnalysisResult]:
+        """
+        Analyze many (document_id, blob_url) pairs concurrently.
+        
+        Results are saved together in batch transactions once all
+        analyses have finished. A failed document is logged and left out
+        of the returned list; the others are still saved.
+        """
+        config = await self._current_config()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_ANALYSES)
+
+        async def analyze(document_id: str, blob_url: str) -> AnalysisResult:
+            async with semaphore:
+                return await self._run_analysis(config, document_id, blob_url)
+
+        documents = list(documents)
+        outcomes = await asyncio.gather(
+            *(analyze(d, u) for d, u in documents), return_exceptions=True
+        )
+        results: list[AnalysisResult] = []
+        for (document_id, _), outcome in zip(documents, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Analysis failed for document {document_id}: {outcome}")
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                results.append(outcome)
+        await asyncio.to_thread(self._docs.save_many, results)
+        return results
+
+    async def _run_analysis(
+        self, config: PipelineConfig, document_id: str, blob_url: str
+    ) -> AnalysisResult:
+        """Call the router analyzer and build the (unsaved) result."""
         # Extract blob name from URL for SAS generation
         blob_name = self._extract_blob_name(blob_url)
         sas_url = self._blob.get_sas_url(blob_name)
 
         # Call Content Understanding
-        raw_result = self._cu.analyze(
-            self._config.azure.router_analyzer_id, sas_url
-        )
+        raw_result = await self._cu.analyze(config.azure.router_analyzer_id, sas_url)
 
         # Parse response
         category_id, fields, confidence = self._parse_cu_response(raw_result)
 
-        # Create and save result
         result = AnalysisResult(
             document_id=document_id,
             category_id=category_id,
             extracted_fields=fields,
             confidence=confidence,
-            analyzed_at=datetime.utcnow(),
+            analyzed_at=datetime.now(timezone.utc),
         )
-        self._docs.save(result)
-
         logger.info(f"Analyzed document {document_id}: category={category_id}")
         return result
 
-    def get_result(self, document_id: str) -> AnalysisResult | None:
+    async def get_result(self, document_id: str) -> AnalysisResult | None:
         """Get analysis result for document."""
-        return self._docs.get(document_id)
+        return await asyncio.to_thread(self._docs.get, document_id)
 
-    def submit_feedback(
+    async def submit_feedback(
         self,
         document_id: str,
         corrected_fields: dict[str, Any],
@@ -99,33 +154,33 @@ class DocumentService:
         
         Stores corrections for future model improvements.
         """
-        feedback_id = str(uuid.uuid4())
+        feedback_id = uuid.uuid4().hex
         feedback = FeedbackRecord(
             feedback_id=feedback_id,
             document_id=document_id,
             corrected_fields=corrected_fields,
             reviewer=reviewer,
             comment=comment,
-            created_at=datetime.utcnow(),
+            created_at=datetime.now(timezone.utc),
         )
-        self._feedback.save(feedback)
+        await asyncio.to_thread(self._feedback.save, feedback)
 
         logger.info(f"Recorded feedback {feedback_id} for document {document_id}")
         return feedback
 
-    def get_feedback(self, document_id: str) -> list[FeedbackRecord]:
+    async def get_feedback(self, document_id: str) -> list[FeedbackRecord]:
         """Get all feedback for a document."""
-        return self._feedback.get_by_document(document_id)
+        return await asyncio.to_thread(self._feedback.get_by_document, document_id)
 
     def _extract_blob_name(self, blob_url: str) -> str:
         """Extract blob name from full URL."""
         # URL format: https://account.blob.core.windows.net/container/blob_name
-        parts = blob_url.split("/")
-        # Find container index and return everything after
-        for i, part in enumerate(parts):
-            if ".blob.core.windows.net" in part:
-                return "/".join(parts[i + 2:])  # Skip container name
-        return blob_url  # Fallback
+        parts = urlsplit(blob_url)
+        path = parts.path.lstrip("/")
+        if not (parts.scheme and parts.netloc and "/" in path):
+            return blob_url  # Already a blob name
+        # Skip container name
+        return path.split("/", 1)[1]
 
     def _parse_cu_response(
         self, response: dict[str, Any]
@@ -155,21 +210,32 @@ class DocumentService:
         return category_id, fields, confidence
 
     def _flatten_fields(self, field_results: dict[str, Any]) -> dict[str, Any]:
-        """Flatten CU field results to simple key-value pairs."""
-        result = {}
-        for name, field in field_results.items():
-            if isinstance(field, dict):
-                if "value" in field:
-                    result[name] = field["value"]
+        """
+        Flatten CU field results to simple key-value pairs.
+        
+        Walks nested objects and arrays with an explicit stack; child dicts
+        are assigned to their parent before being filled, so key order
+        matches the response.
+        """
+        result: dict[str, Any] = {}
+        stack = [(result, field_results)]
+        while stack:
+            out, fields = stack.pop()
+            for name, field in fields.items():
+                if not isinstance(field, dict):
+                    out[name] = field
+                elif "value" in field:
+                    out[name] = field["value"]
                 elif "values" in field:
                     # Array field
-                    result[name] = [
-                        self._flatten_fields(item) if isinstance(item, dict) else item
-                        for item in field["values"]
-                    ]
+                    items = out[name] = list(field["values"])
+                    for i, item in enumerate(items):
+                        if isinstance(item, dict):
+                            child: dict[str, Any] = {}
+                            items[i] = child
+                            stack.append((child, item))
                 else:
                     # Nested object
-                    result[name] = self._flatten_fields(field)
-            else:
-                result[name] = field
+                    out[name] = child = {}
+                    stack.append((child, field))
         return result
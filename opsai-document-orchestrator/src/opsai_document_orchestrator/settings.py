@@ -1,16 +1,16 @@
 """Environment-based settings following 12-factor app principles."""
 
 import os
-from dataclasses import dataclass
 from functools import lru_cache
+from typing import NamedTuple
 
 
-@dataclass(frozen=True, slots=True)
-class Settings:
+class Settings(NamedTuple):
     """Application settings from environment variables."""
     # Azure Storage
     storage_connection_string: str
     storage_container: str
+    storage_create_container: bool
 
     # Azure Content Understanding
     cu_endpoint: str
@@ -26,13 +26,25 @@ class Settings:
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
     """Load settings from environment variables."""
+    env = os.environ.get
     return Settings(
-        storage_connection_string=os.getenv("AZURE_STORAGE_CONNECTION_STRING", ""),
-        storage_container=os.getenv("AZURE_STORAGE_CONTAINER", "documents"),
-        cu_endpoint=os.getenv("AZURE_CU_ENDPOINT", ""),
-        cu_api_key=os.getenv("AZURE_CU_API_KEY", ""),
-        cu_api_version=os.getenv("AZURE_CU_API_VERSION", "2025-05-01-preview"),
-        table_connection_string=os.getenv("AZURE_TABLE_CONNECTION_STRING", ""),
-        table_results=os.getenv("AZURE_TABLE_RESULTS", "AnalysisResults"),
-        table_feedback=os.getenv("AZURE_TABLE_FEEDBACK", "FeedbackRecords"),
+        storage_connection_string=env("AZURE_STORAGE_CONNECTION_STRING", ""),
+        storage_container=env("AZURE_STORAGE_CONTAINER", "documents"),
+        storage_create_container=env("CREATE_CONTAINER_IF_MISSING", "0") == "1",
+        cu_endpoint=env("AZURE_CU_ENDPOINT", ""),
+        cu_api_key=env("AZURE_CU_API_KEY", ""),
+        cu_api_version=env("AZURE_CU_API_VERSION", "2025-05-01-preview"),
+        table_connection_string=env("AZURE_TABLE_CONNECTION_STRING", ""),
+        table_results=env("AZURE_TABLE_RESULTS", "AnalysisResults"),
+        table_feedback=env("AZURE_TABLE_FEEDBACK", "FeedbackRecords"),
     )
+
+
+def reload_settings() -> Settings:
+    """
+    Re-read settings from the environment (e.g. after tests change it).
+    
+    Clients already built by the factory keep the settings they were built with.
+    """
+    get_settings.cache_clear()
+    return get_settings()
@@ -0,0 +1,101 @@
+"""Tests for BlobStorageClient."""
+
+import io
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from src.opsai_document_orchestrator.clients import blob_client
+from src.opsai_document_orchestrator.clients.blob_client import BlobStorageClient
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+@pytest.fixture
+def sas_calls(monkeypatch):
+    """Count SAS tokens signed, returning a distinct token each time."""
+    calls = []
+
+    def generate_blob_sas(**kwargs):
+        calls.append(kwargs["blob_name"])
+        return f"sig={len(calls)}"
+
+    monkeypatch.setattr(blob_client, "generate_blob_sas", generate_blob_sas)
+    return calls
+
+
+@pytest.fixture
+def client():
+    """BlobStorageClient with a mocked container client."""
+    client = BlobStorageClient(CONNECTION_STRING, "documents")
+    container = MagicMock()
+    container.get_blob_client.side_effect = lambda name: MagicMock(
+        url=f"https://testaccount.blob.core.windows.net/documents/{name}",
+        delete_blob=AsyncMock(),
+    )
+    client._container_client = container
+    return client
+
+
+def test_sas_url_reused_on_second_call(client, sas_calls):
+    """Test that a default-expiry SAS URL is signed once and then cached."""
+    first = client.get_sas_url("doc-1/a.pdf")
+
+    assert client.get_sas_url("doc-1/a.pdf") == first
+    assert sas_calls == ["doc-1/a.pdf"]
+
+
+def test_sas_url_with_custom_expiry_not_cached(client, sas_calls):
+    """Test that a non-default expiry always signs a fresh token."""
+    first = client.get_sas_url("doc-1/a.pdf", expiry_hours=1)
+
+    assert client.get_sas_url("doc-1/a.pdf", expiry_hours=1) != first
+    client.get_sas_url("doc-1/a.pdf")  # custom-expiry URLs left the cache empty
+    assert len(sas_calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_delete_invalidates_cached_sas_url(client, sas_calls):
+    """Test that a deleted blob gets a new SAS URL if it is re-uploaded."""
+    first = client.get_sas_url("doc-1/a.pdf")
+
+    await client.delete("doc-1/a.pdf")
+
+    assert client.get_sas_url("doc-1/a.pdf") != first
+    assert len(sas_calls) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("create_container, exists_calls", [(False, 0), (True, 1)])
+async def test_container_provisioned_only_when_configured(create_container, exists_calls):
+    """Test that uploads probe/create the container only with create_container, and once."""
+    client = BlobStorageClient(CONNECTION_STRING, "documents", create_container=create_container)
+    container = MagicMock()
+    container.exists = AsyncMock(return_value=False)
+    container.create_container = AsyncMock()
+    container.get_blob_client.return_value = MagicMock(upload_blob=AsyncMock())
+    client._container_client = container
+
+    await client.upload("doc-1/a.pdf", b"data", "application/pdf")
+    await client.upload("doc-2/b.pdf", b"data", "application/pdf")
+
+    assert container.exists.await_count == exists_calls
+    assert container.create_container.await_count == exists_calls
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_hands_stream_to_sdk(client):
+    """Test that the seekable stream itself reaches upload_blob, so small files are one put."""
+    blob = MagicMock(url="https://testaccount.blob.core.windows.net/documents/doc-1/a.pdf")
+    blob.upload_blob = AsyncMock()
+    client._container_client.get_blob_client.side_effect = None
+    client._container_client.get_blob_client.return_value = blob
+    stream = io.BytesIO(b"0123456789")
+
+    await client.upload_stream("doc-1/a.pdf", stream, "application/pdf")
+
+    assert blob.upload_blob.await_args.args == (stream,)
+    assert "length" not in blob.upload_blob.await_args.kwargs
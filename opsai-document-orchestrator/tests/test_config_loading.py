@@ -1,5 +1,7 @@
 """Tests for configuration loading."""
 
+import json
+import os
 import tempfile
 from pathlib import Path
 
@@ -113,3 +115,60 @@ def test_parse_config_uses_defaults():
     config = _parse_config(config_data)
     assert config.azure.api_version == "2025-05-01-preview"
     assert config.categories == []
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Write SAMPLE_CONFIG to a temp file and point CONFIG_FILE_PATH at it."""
+    path = tmp_path / "pipeline.yaml"
+    path.write_text(yaml.safe_dump(SAMPLE_CONFIG), encoding="utf-8")
+    monkeypatch.setenv("CONFIG_FILE_PATH", str(path))
+    return path
+
+
+def test_load_config_reuses_cached_config(config_file):
+    """Test that an unchanged file is not parsed again."""
+    assert load_config() is load_config()
+
+
+def test_load_config_picks_up_file_changes(config_file):
+    """Test that editing the file invalidates the cache."""
+    first = load_config()
+
+    data = dict(SAMPLE_CONFIG, azure=dict(SAMPLE_CONFIG["azure"], router_analyzer_id="new-router"))
+    config_file.write_text(yaml.safe_dump(data), encoding="utf-8")
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    second = load_config()
+    assert second is not first
+    assert second.azure.router_analyzer_id == "new-router"
+
+
+def test_load_config_missing_file_raises(tmp_path, monkeypatch):
+    """Test that a missing config file raises ConfigError."""
+    monkeypatch.setenv("CONFIG_FILE_PATH", str(tmp_path / "missing.yaml"))
+    with pytest.raises(ConfigError):
+        load_config()
+
+
+def test_load_config_from_json(tmp_path, monkeypatch):
+    """Test that a .json config file is loaded."""
+    path = tmp_path / "pipeline.json"
+    path.write_text(json.dumps(SAMPLE_CONFIG), encoding="utf-8")
+    monkeypatch.setenv("CONFIG_FILE_PATH", str(path))
+
+    config = load_config()
+    assert config.azure.router_analyzer_id == "test-router"
+    assert config.categories[0].extraction_schema["field2"]["type"] == "number"
+
+
+def test_load_config_rejects_invalid_schema(tmp_path, monkeypatch):
+    """Test that schema violations raise ConfigError with the offending path."""
+    data = {"categories": [{"id": "cat", "display_name": "Cat"}]}
+    path = tmp_path / "pipeline.yaml"
+    path.write_text(yaml.safe_dump(data), encoding="utf-8")
+    monkeypatch.setenv("CONFIG_FILE_PATH", str(path))
+
+    with pytest.raises(ConfigError, match="analyzer_id"):
+        load_config()
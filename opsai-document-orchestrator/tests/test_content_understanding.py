@@ -0,0 +1,86 @@
+"""Tests for ContentUnderstandingClient polling."""
+
+from unittest.mock import AsyncMock, patch
+
+import httpx
+import pytest
+
+from src.opsai_document_orchestrator.clients.content_understanding import (
+    ContentUnderstandingClient,
+    ContentUnderstandingError,
+)
+
+OPERATION_URL = "https://test.azure.com/contentunderstanding/analyzerResults/op-1"
+
+
+def make_client(handler) -> ContentUnderstandingClient:
+    """Create client whose HTTP calls are served by handler."""
+    client = ContentUnderstandingClient("https://test.azure.com", "key")
+    client._client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def operation_handler(statuses: list[str], retry_after: str | None = None):
+    """Return 202 on submit, then the given statuses on each poll."""
+    polls = iter(statuses)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.method == "POST":
+            return httpx.Response(202, headers={"Operation-Location": OPERATION_URL})
+        headers = {"Retry-After": retry_after} if retry_after else {}
+        status = next(polls)
+        body = {"status": status, "result": {"fields": {}}}
+        if status == "Failed":
+            body["error"] = {"message": "bad document"}
+        return httpx.Response(200, headers=headers, json=body)
+
+    return handler
+
+
+@pytest.mark.asyncio
+async def test_analyze_backs_off_exponentially():
+    """Test that poll delays grow and are capped."""
+    client = make_client(operation_handler(["Running"] * 5 + ["Succeeded"]))
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep, \
+            patch("random.uniform", return_value=1.0):
+        result = await client.analyze("router", "https://blob/doc.pdf", max_interval=0.5)
+
+    assert result == {"fields": {}}
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays == pytest.approx([0.2, 0.3, 0.45, 0.5, 0.5, 0.5])
+
+
+@pytest.mark.asyncio
+async def test_analyze_honors_retry_after():
+    """Test that Retry-After overrides the computed delay."""
+    client = make_client(operation_handler(["Running", "Succeeded"], retry_after="3"))
+
+    with patch("asyncio.sleep", new_callable=AsyncMock) as sleep:
+        await client.analyze("router", "https://blob/doc.pdf")
+
+    delays = [call.args[0] for call in sleep.await_args_list]
+    assert delays[1] == 3.0
+
+
+@pytest.mark.asyncio
+async def test_analyze_raises_on_failed_status():
+    """Test that a failed operation raises ContentUnderstandingError."""
+    client = make_client(operation_handler(["Failed"]))
+
+    with patch("asyncio.sleep", new_callable=AsyncMock):
+        with pytest.raises(ContentUnderstandingError, match="bad document"):
+            await client.analyze("router", "https://blob/doc.pdf")
+
+
+@pytest.mark.asyncio
+async def test_begin_analyze_returns_operation_url():
+    """Test that callers can poll the operation themselves."""
+    client = make_client(operation_handler(["Running", "Succeeded"]))
+
+    result, operation_url = await client.begin_analyze("router", "https://blob/doc.pdf")
+
+    assert result is None
+    assert operation_url == OPERATION_URL
+    assert await client.get_operation_result(operation_url) is None
+    assert await client.get_operation_result(operation_url) == {"fields": {}}
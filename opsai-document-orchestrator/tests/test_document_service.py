@@ -1,10 +1,15 @@
 """Tests for DocumentService."""
 
+import io
+import os
 from datetime import datetime
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+import yaml
 
+from src.opsai_document_orchestrator import factory
+from src.opsai_document_orchestrator.config import config_to_dict
 from src.opsai_document_orchestrator.models import (
     AnalysisResult,
     FeedbackRecord,
@@ -19,7 +24,7 @@ from src.opsai_document_orchestrator.services.document_service import DocumentSe
 def mock_blob_client():
     """Create mock blob client."""
     client = MagicMock()
-    client.upload.return_value = "https://storage.blob.core.windows.net/docs/test.pdf"
+    client.upload_stream = AsyncMock(return_value="https://storage.blob.core.windows.net/docs/test.pdf")
     client.get_sas_url.return_value = "https://storage.blob.core.windows.net/docs/test.pdf?sas=token"
     return client
 
@@ -28,13 +33,13 @@ def mock_blob_client():
 def mock_cu_client():
     """Create mock Content Understanding client."""
     client = MagicMock()
-    client.analyze.return_value = {
+    client.analyze = AsyncMock(return_value={
         "contents": [{"category": {"id": "health_claim", "confidence": 0.95}}],
         "fields": {
             "docType": {"value": "HealthClaim"},
             "totalClaimed": {"value": 1500.00},
         },
-    }
+    })
     return client
 
 
@@ -88,28 +93,30 @@ def service(mock_blob_client, mock_cu_client, mock_doc_repo, mock_feedback_repo,
 class TestUploadDocument:
     """Tests for upload_document method."""
 
-    def test_upload_returns_document_id_and_url(self, service, mock_blob_client):
+    @pytest.mark.asyncio
+    async def test_upload_returns_document_id_and_url(self, service, mock_blob_client):
         """Test that upload returns document ID and blob URL."""
-        doc_id, blob_url = service.upload_document(
+        doc_id, blob_url = await service.upload_document(
             filename="test.pdf",
-            content=b"PDF content",
+            stream=io.BytesIO(b"PDF content"),
             content_type="application/pdf",
         )
 
         assert doc_id is not None
-        assert len(doc_id) == 36  # UUID format
+        assert len(doc_id) == 32  # UUID format
         assert blob_url.startswith("https://")
-        mock_blob_client.upload.assert_called_once()
+        mock_blob_client.upload_stream.assert_called_once()
 
-    def test_upload_uses_correct_blob_name(self, service, mock_blob_client):
+    @pytest.mark.asyncio
+    async def test_upload_uses_correct_blob_name(self, service, mock_blob_client):
         """Test that blob name includes document ID and filename."""
-        doc_id, _ = service.upload_document(
+        doc_id, _ = await service.upload_document(
             filename="invoice.pdf",
-            content=b"content",
+            stream=io.BytesIO(b"content"),
             content_type="application/pdf",
         )
 
-        call_args = mock_blob_client.upload.call_args
+        call_args = mock_blob_client.upload_stream.call_args
         blob_name = call_args[0][0]
         assert doc_id in blob_name
         assert "invoice.pdf" in blob_name
@@ -118,9 +125,10 @@ class TestUploadDocument:
 class TestAnalyzeDocument:
     """Tests for analyze_document method."""
 
-    def test_analyze_returns_result(self, service, mock_cu_client, mock_doc_repo):
+    @pytest.mark.asyncio
+    async def test_analyze_returns_result(self, service, mock_cu_client, mock_doc_repo):
         """Test that analyze returns AnalysisResult."""
-        result = service.analyze_document(
+        result = await service.analyze_document(
             document_id="test-123",
             blob_url="https://storage.blob.core.windows.net/docs/test-123/file.pdf",
         )
@@ -130,9 +138,10 @@ class TestAnalyzeDocument:
         assert result.category_id == "health_claim"
         assert result.confidence == 0.95
 
-    def test_analyze_saves_result(self, service, mock_doc_repo):
+    @pytest.mark.asyncio
+    async def test_analyze_saves_result(self, service, mock_doc_repo):
         """Test that analysis result is saved to repository."""
-        service.analyze_document(
+        await service.analyze_document(
             document_id="test-123",
             blob_url="https://storage.blob.core.windows.net/docs/test-123/file.pdf",
         )
@@ -141,9 +150,10 @@ class TestAnalyzeDocument:
         saved_result = mock_doc_repo.save.call_args[0][0]
         assert saved_result.document_id == "test-123"
 
-    def test_analyze_extracts_fields(self, service):
+    @pytest.mark.asyncio
+    async def test_analyze_extracts_fields(self, service):
         """Test that fields are extracted from CU response."""
-        result = service.analyze_document(
+        result = await service.analyze_document(
             document_id="test-123",
             blob_url="https://storage.blob.core.windows.net/docs/test-123/file.pdf",
         )
@@ -151,13 +161,107 @@ class TestAnalyzeDocument:
         assert result.extracted_fields["docType"] == "HealthClaim"
         assert result.extracted_fields["totalClaimed"] == 1500.00
 
+    @pytest.mark.asyncio
+    async def test_cached_service_sees_config_file_edits(
+        self, tmp_path, monkeypatch, config, mock_blob_client, mock_cu_client,
+        mock_doc_repo, mock_feedback_repo,
+    ):
+        """Test that the factory's service re-reads the config file once it changes."""
+        path = tmp_path / "pipeline.yaml"
+        monkeypatch.setenv("CONFIG_FILE_PATH", str(path))
+        for name, mock in [
+            ("get_blob_client", mock_blob_client),
+            ("get_cu_client", mock_cu_client),
+            ("get_doc_repository", mock_doc_repo),
+            ("get_feedback_repository", mock_feedback_repo),
+        ]:
+            monkeypatch.setattr(factory, name, lambda mock=mock: mock)
+        factory.get_document_service.cache_clear()
+        blob_url = "https://storage.blob.core.windows.net/docs/doc-1/a.pdf"
+
+        try:
+            service = factory.get_document_service()
+            for i, router_id in enumerate(["router-v1", "router-v2"]):
+                data = config_to_dict(config)
+                data["azure"]["router_analyzer_id"] = router_id
+                path.write_text(yaml.safe_dump(data), encoding="utf-8")
+                # Distinct mtimes even on filesystems with coarse timestamps
+                os.utime(path, (1_700_000_000 + i, 1_700_000_000 + i))
+
+                assert factory.get_document_service() is service
+                await service.analyze_document("doc-1", blob_url)
+
+                assert mock_cu_client.analyze.await_args.args[0] == router_id
+        finally:
+            factory.get_document_service.cache_clear()
+
+    def test_extract_blob_name_skips_container(self, service):
+        """Test that the container segment and any SAS query are dropped."""
+        blob_name = service._extract_blob_name(
+            "https://storage.blob.core.windows.net/docs/test-123/file.pdf?sv=token"
+        )
+
+        assert blob_name == "test-123/file.pdf"
+
+    def test_extract_blob_name_keeps_bare_names(self, service):
+        """Test that a blob name without scheme and host is returned unchanged."""
+        assert service._extract_blob_name("abc123/file.pdf") == "abc123/file.pdf"
+
+    def test_flatten_nested_fields_preserves_order(self, service):
+        """Test that nested objects and arrays flatten in response order."""
+        flattened = service._flatten_fields({
+            "patient": {"name": {"value": "A"}, "address": {"city": {"value": "X"}}},
+            "lines": {"values": [{"code": {"value": "A1"}}, "raw"]},
+            "total": {"value": 10},
+        })
+
+        assert flattened == {
+            "patient": {"name": "A", "address": {"city": "X"}},
+            "lines": [{"code": "A1"}, "raw"],
+            "total": 10,
+        }
+        assert list(flattened) == ["patient", "lines", "total"]
+
+    @pytest.mark.asyncio
+    async def test_bulk_analyze_saves_once(self, service, mock_cu_client, mock_doc_repo):
+        """Test that bulk analysis saves all results in one batch call."""
+        results = await service.bulk_analyze([
+            ("doc-1", "https://storage.blob.core.windows.net/docs/doc-1/a.pdf"),
+            ("doc-2", "https://storage.blob.core.windows.net/docs/doc-2/b.pdf"),
+        ])
+
+        assert [r.document_id for r in results] == ["doc-1", "doc-2"]
+        assert mock_cu_client.analyze.await_count == 2
+        mock_doc_repo.save_many.assert_called_once_with(results)
+        mock_doc_repo.save.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_bulk_analyze_saves_successes_when_one_fails(
+        self, service, mock_cu_client, mock_doc_repo, caplog
+    ):
+        """Test that one failed analysis neither drops the others nor skips the save."""
+        mock_cu_client.analyze.side_effect = [
+            RuntimeError("CU unavailable"),
+            mock_cu_client.analyze.return_value,
+        ]
+
+        results = await service.bulk_analyze([
+            ("doc-1", "https://storage.blob.core.windows.net/docs/doc-1/a.pdf"),
+            ("doc-2", "https://storage.blob.core.windows.net/docs/doc-2/b.pdf"),
+        ])
+
+        assert [r.document_id for r in results] == ["doc-2"]
+        mock_doc_repo.save_many.assert_called_once_with(results)
+        assert "doc-1" in caplog.text
+
 
 class TestSubmitFeedback:
     """Tests for submit_feedback method."""
 
-    def test_feedback_creates_record(self, service, mock_feedback_repo):
+    @pytest.mark.asyncio
+    async def test_feedback_creates_record(self, service, mock_feedback_repo):
         """Test that feedback creates a record."""
-        feedback = service.submit_feedback(
+        feedback = await service.submit_feedback(
             document_id="test-123",
             corrected_fields={"totalClaimed": 1600.00},
             reviewer="test_user",
@@ -169,9 +273,10 @@ class TestSubmitFeedback:
         assert feedback.corrected_fields["totalClaimed"] == 1600.00
         assert feedback.reviewer == "test_user"
 
-    def test_feedback_is_saved(self, service, mock_feedback_repo):
+    @pytest.mark.asyncio
+    async def test_feedback_is_saved(self, service, mock_feedback_repo):
         """Test that feedback is saved to repository."""
-        service.submit_feedback(
+        await service.submit_feedback(
             document_id="test-123",
             corrected_fields={"field": "value"},
         )
@@ -182,7 +287,8 @@ class TestSubmitFeedback:
 class TestGetResult:
     """Tests for get_result method."""
 
-    def test_get_returns_stored_result(self, service, mock_doc_repo):
+    @pytest.mark.asyncio
+    async def test_get_returns_stored_result(self, service, mock_doc_repo):
         """Test retrieving stored result."""
         stored_result = AnalysisResult(
             document_id="test-123",
@@ -191,15 +297,16 @@ class TestGetResult:
         )
         mock_doc_repo.get.return_value = stored_result
 
-        result = service.get_result("test-123")
+        result = await service.get_result("test-123")
 
         assert result == stored_result
         mock_doc_repo.get.assert_called_once_with("test-123")
 
-    def test_get_returns_none_for_missing(self, service, mock_doc_repo):
+    @pytest.mark.asyncio
+    async def test_get_returns_none_for_missing(self, service, mock_doc_repo):
         """Test that None is returned for missing document."""
         mock_doc_repo.get.return_value = None
 
-        result = service.get_result("nonexistent")
+        result = await service.get_result("nonexistent")
 
         assert result is None
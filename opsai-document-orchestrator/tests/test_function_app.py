@@ -0,0 +1,89 @@
+"""Tests for HTTP endpoints."""
+
+import json
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock
+
+import azure.functions as func
+import pytest
+import yaml
+
+import function_app
+from src.opsai_document_orchestrator.models import AnalysisResult
+
+VALID_BODY = {
+    "azure": {"endpoint": "https://test.azure.com", "router_analyzer_id": "router"},
+    "categories": [
+        {
+            "id": "claim",
+            "display_name": "Claim",
+            "analyzer_id": "claim-extractor",
+            "extraction_schema": {"total": {"type": "number"}},
+        }
+    ],
+}
+
+
+@pytest.fixture
+def config_file(tmp_path, monkeypatch):
+    """Point CONFIG_FILE_PATH at an empty temp config file."""
+    path = tmp_path / "pipeline.yaml"
+    path.write_text(yaml.safe_dump({"categories": []}), encoding="utf-8")
+    monkeypatch.setenv("CONFIG_FILE_PATH", str(path))
+    return path
+
+
+async def put_config(body: dict) -> func.HttpResponse:
+    """Call the PUT /config handler with a JSON body."""
+    request = func.HttpRequest(
+        method="PUT", url="/api/config", body=json.dumps(body).encode()
+    )
+    return await function_app.update_config._function.get_user_function()(request)
+
+
+@pytest.mark.asyncio
+async def test_update_config_saves_valid_config(config_file):
+    """Test that a valid body is written to the config file."""
+    response = await put_config(VALID_BODY)
+
+    assert response.status_code == 200
+    saved = yaml.safe_load(config_file.read_text(encoding="utf-8"))
+    assert saved["categories"][0]["analyzer_id"] == "claim-extractor"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("category_update, message", [
+    ({"analyzer_id": "my extractor"}, "analyzer_id"),
+    ({"extraction_schema": {"total": {"type": "float"}}}, "type"),
+])
+async def test_update_config_rejects_invalid_config(config_file, category_update, message):
+    """Test that a body load_config would reject returns 400 and is not saved."""
+    before = config_file.read_text(encoding="utf-8")
+    body = dict(VALID_BODY, categories=[dict(VALID_BODY["categories"][0], **category_update)])
+
+    response = await put_config(body)
+
+    assert response.status_code == 400
+    assert message in json.loads(response.get_body())["error"]
+    assert config_file.read_text(encoding="utf-8") == before
+
+
+@pytest.mark.asyncio
+async def test_get_result_embeds_stored_fields_without_decoding(monkeypatch):
+    """Test that stored extracted_fields JSON is passed through undecoded."""
+    result = AnalysisResult.from_raw_fields(
+        "doc-1", "claim", '{"total": 1500.0}', 0.9, datetime(2025, 1, 2, tzinfo=timezone.utc)
+    )
+    service = MagicMock()
+    service.get_result = AsyncMock(return_value=result)
+    monkeypatch.setattr(function_app, "get_document_service", lambda: service)
+    request = func.HttpRequest(
+        method="GET", url="/api/documents/doc-1/result", body=b"",
+        route_params={"document_id": "doc-1"},
+    )
+
+    response = await function_app.get_result._function.get_user_function()(request)
+
+    assert response.status_code == 200
+    assert json.loads(response.get_body())["extracted_fields"] == {"total": 1500.0}
+    assert result.raw_fields_json is not None
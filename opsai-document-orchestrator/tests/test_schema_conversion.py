@@ -1,31 +1,184 @@
 """Tests for extraction schema to CU fieldSchema conversion."""
 
+import asyncio
+from types import MappingProxyType
+
 import pytest
 
+from src.opsai_document_orchestrator.factory import get_analyzer_builder
 from src.opsai_document_orchestrator.services.analyzer_builder import AnalyzerBuilder
-from src.opsai_document_orchestrator.models import Category
+from src.opsai_document_orchestrator.models import AzureSettings, Category, PipelineConfig
+
+
+def _readonly(schema):
+    """Wrap a schema literal, and every dict nested in it, in MappingProxyType."""
+    if isinstance(schema, dict):
+        return MappingProxyType({k: _readonly(v) for k, v in schema.items()})
+    return schema
+
+
+# Schema inputs, built once at import and read-only so no test can alter them
+_SIMPLE_STRING_SCHEMA = _readonly({"name": {"type": "string", "description": "A name field"}})
+_NUMBER_SCHEMA = _readonly({"amount": {"type": "number", "description": "An amount"}})
+_ADDRESS_SCHEMA = _readonly({
+    "address": {
+        "type": "object",
+        "description": "Address details",
+        "properties": {
+            "street": {"type": "string"},
+            "city": {"type": "string"},
+            "zip": {"type": "string"},
+        },
+    }
+})
+_LINE_ITEMS_SCHEMA = _readonly({
+    "items": {
+        "type": "array",
+        "description": "List of items",
+        "items": {
+            "type": "object",
+            "properties": {
+                "name": {"type": "string"},
+                "quantity": {"type": "number"},
+            },
+        },
+    }
+})
+_COMPLEX_CLAIM_SCHEMA = _readonly({
+    "claim": {
+        "type": "object",
+        "properties": {
+            "member": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "string"},
+                    "name": {"type": "string"},
+                },
+            },
+            "lines": {
+                "type": "array",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "code": {"type": "string"},
+                        "amount": {"type": "number"},
+                    },
+                },
+            },
+        },
+    }
+})
 
 
 class MockCUClient:
     """Mock Content Understanding client for testing."""
 
     def __init__(self):
-        self.created_analyzers = {}
+        # (analyzer_id, body) in creation order
+        self.created = []
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def create_analyzer(self, analyzer_id: str, body: dict):
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        await asyncio.sleep(0)
+        self.in_flight -= 1
+        self.created.append((analyzer_id, body))
+
+    @property
+    def created_analyzers(self) -> dict:
+        """Created analyzer bodies by ID, last write wins."""
+        return dict(self.created)
+
+
+def make_pipeline_config(category_count: int) -> PipelineConfig:
+    """Create config with the given number of simple categories."""
+    return PipelineConfig(
+        azure=AzureSettings(
+            endpoint="https://test.azure.com",
+            api_version="2025-05-01-preview",
+            router_analyzer_id="router",
+        ),
+        categories=[
+            Category(
+                id=f"cat{i}",
+                display_name=f"Category {i}",
+                analyzer_id=f"analyzer{i}",
+                classification_prompt=f"Category {i} documents",
+                extraction_schema={"field": {"type": "string"}},
+            )
+            for i in range(category_count)
+        ],
+    )
 
-    def create_analyzer(self, analyzer_id: str, body: dict):
-        self.created_analyzers[analyzer_id] = body
+
+@pytest.fixture(scope="module")
+def sample_category():
+    """Category with a flat two-field schema, shared by the module."""
+    return Category(
+        id="test_cat",
+        display_name="Test Category",
+        analyzer_id="test-analyzer",
+        classification_prompt="Test prompt",
+        extraction_schema={
+            "field1": {"type": "string"},
+            "field2": {"type": "number"},
+        },
+    )
+
+
+@pytest.fixture(scope="module")
+def sample_categories():
+    """Two schema-less categories, shared by the module."""
+    return (
+        Category(
+            id="cat1",
+            display_name="Category 1",
+            analyzer_id="analyzer1",
+            classification_prompt="Category 1 documents",
+            extraction_schema={},
+        ),
+        Category(
+            id="cat2",
+            display_name="Category 2",
+            analyzer_id="analyzer2",
+            classification_prompt="Category 2 documents",
+            extraction_schema={},
+        ),
+    )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
+def sample_config(sample_categories):
+    """Pipeline config over sample_categories, shared by the module."""
+    return PipelineConfig(
+        azure=AzureSettings(
+            endpoint="https://test.azure.com",
+            api_version="2025-05-01-preview",
+            router_analyzer_id="router",
+        ),
+        categories=list(sample_categories),
+    )
+
+
+@pytest.fixture(scope="session")
 def builder():
-    """Create AnalyzerBuilder with mock client."""
+    """AnalyzerBuilder with mock client, shared so its caches stay warm."""
     return AnalyzerBuilder(MockCUClient())
 
 
+@pytest.fixture(autouse=True)
+def _reset_mock_client(builder):
+    """Forget analyzers created by the previous test."""
+    yield
+    builder._client.created.clear()
+    builder._client.peak_in_flight = 0
+
+
 def test_convert_simple_string_field(builder):
     """Test conversion of simple string field."""
-    schema = {"name": {"type": "string", "description": "A name field"}}
-    result = builder._convert_schema(schema)
+    result = builder._convert_schema(_SIMPLE_STRING_SCHEMA)
 
     assert result["name"]["type"] == "string"
     assert result["name"]["description"] == "A name field"
@@ -33,26 +186,14 @@ def test_convert_simple_string_field(builder):
 
 def test_convert_number_field(builder):
     """Test conversion of number field."""
-    schema = {"amount": {"type": "number", "description": "An amount"}}
-    result = builder._convert_schema(schema)
+    result = builder._convert_schema(_NUMBER_SCHEMA)
 
     assert result["amount"]["type"] == "number"
 
 
 def test_convert_nested_object(builder):
     """Test conversion of nested object field."""
-    schema = {
-        "address": {
-            "type": "object",
-            "description": "Address details",
-            "properties": {
-                "street": {"type": "string"},
-                "city": {"type": "string"},
-                "zip": {"type": "string"},
-            },
-        }
-    }
-    result = builder._convert_schema(schema)
+    result = builder._convert_schema(_ADDRESS_SCHEMA)
 
     assert result["address"]["type"] == "object"
     assert "properties" in result["address"]
@@ -62,20 +203,7 @@ def test_convert_nested_object(builder):
 
 def test_convert_array_field(builder):
     """Test conversion of array field."""
-    schema = {
-        "items": {
-            "type": "array",
-            "description": "List of items",
-            "items": {
-                "type": "object",
-                "properties": {
-                    "name": {"type": "string"},
-                    "quantity": {"type": "number"},
-                },
-            },
-        }
-    }
-    result = builder._convert_schema(schema)
+    result = builder._convert_schema(_LINE_ITEMS_SCHEMA)
 
     assert result["items"]["type"] == "array"
     assert "items" in result["items"]
@@ -85,31 +213,7 @@ def test_convert_array_field(builder):
 
 def test_convert_complex_nested_schema(builder):
     """Test conversion of deeply nested schema."""
-    schema = {
-        "claim": {
-            "type": "object",
-            "properties": {
-                "member": {
-                    "type": "object",
-                    "properties": {
-                        "id": {"type": "string"},
-                        "name": {"type": "string"},
-                    },
-                },
-                "lines": {
-                    "type": "array",
-                    "items": {
-                        "type": "object",
-                        "properties": {
-                            "code": {"type": "string"},
-                            "amount": {"type": "number"},
-                        },
-                    },
-                },
-            },
-        }
-    }
-    result = builder._convert_schema(schema)
+    result = builder._convert_schema(_COMPLEX_CLAIM_SCHEMA)
 
     # Verify structure preserved
     claim = result["claim"]
@@ -124,56 +228,48 @@ def test_convert_complex_nested_schema(builder):
     assert lines["items"]["properties"]["code"]["type"] == "string"
 
 
-def test_build_category_analyzer(builder):
-    """Test building analyzer definition for a category."""
-    category = Category(
-        id="test_cat",
-        display_name="Test Category",
-        analyzer_id="test-analyzer",
-        classification_prompt="Test prompt",
-        extraction_schema={
-            "field1": {"type": "string"},
-            "field2": {"type": "number"},
-        },
-    )
+def test_convert_schema_treats_other_types_as_leaves(builder):
+    """Test that unlisted types pass through and drop nested keys."""
+    result = builder._convert_schema({
+        "visit_date": {"type": "date", "description": "Date of visit"},
+        "code": {"type": "string", "properties": {"x": {"type": "string"}}},
+    })
+
+    assert result == {
+        "visit_date": {"type": "date", "description": "Date of visit"},
+        "code": {"type": "string"},
+    }
+
+
+def test_convert_schema_beyond_recursion_limit(builder):
+    """Test that nesting deeper than the interpreter stack still converts."""
+    schema = leaf = {"type": "string"}
+    for _ in range(2000):
+        schema = {"type": "object", "properties": {"child": schema}}
 
-    result = builder.build_category_analyzer(category)
+    # Repeat conversions (e.g. a second setup run) must not fail either
+    for _ in range(2):
+        result = builder._convert_schema({"root": schema})
+
+        node = result["root"]
+        while node["type"] == "object":
+            node = node["properties"]["child"]
+        assert node == leaf
+
+
+def test_build_category_analyzer(builder, sample_category):
+    """Test building analyzer definition for a category."""
+    result = builder.build_category_analyzer(sample_category)
 
     assert result["baseAnalyzerId"] == "prebuilt-document"
-    assert "Extractor for Test Category" in result["description"]
+    assert result["description"] == "Extractor for Test Category"
     assert "fieldSchema" in result
     assert "field1" in result["fieldSchema"]
 
 
-def test_build_router_analyzer(builder):
+def test_build_router_analyzer(builder, sample_config):
     """Test building router analyzer definition."""
-    from src.opsai_document_orchestrator.models import AzureSettings, PipelineConfig
-
-    config = PipelineConfig(
-        azure=AzureSettings(
-            endpoint="https://test.azure.com",
-            api_version="2025-05-01-preview",
-            router_analyzer_id="router",
-        ),
-        categories=[
-            Category(
-                id="cat1",
-                display_name="Category 1",
-                analyzer_id="analyzer1",
-                classification_prompt="Category 1 documents",
-                extraction_schema={},
-            ),
-            Category(
-                id="cat2",
-                display_name="Category 2",
-                analyzer_id="analyzer2",
-                classification_prompt="Category 2 documents",
-                extraction_schema={},
-            ),
-        ],
-    )
-
-    result = builder.build_router_analyzer(config)
+    result = builder.build_router_analyzer(sample_config)
 
     assert result["baseAnalyzerId"] == "prebuilt-document"
     assert "config" in result
@@ -183,3 +279,46 @@ def test_build_router_analyzer(builder):
     assert categories[0]["id"] == "cat1"
     assert categories[0]["analyzerId"] == "analyzer1"
     assert categories[1]["id"] == "cat2"
+
+
+@pytest.mark.asyncio
+async def test_setup_all_creates_router_after_categories(builder):
+    """Test that all category analyzers exist before the router is created."""
+    await builder.setup_all(make_pipeline_config(12))
+
+    created = list(builder._client.created_analyzers)
+    assert len(created) == 13
+    assert created[-1] == "router"
+
+
+@pytest.mark.asyncio
+async def test_setup_all_bounds_concurrent_creates():
+    """Test that no more than max_concurrency category creates overlap."""
+    client = MockCUClient()
+    builder = AnalyzerBuilder(client, max_concurrency=3)
+
+    await builder.setup_all(make_pipeline_config(12))
+
+    assert client.peak_in_flight == 3
+    assert len(client.created_analyzers) == 13
+
+
+@pytest.mark.asyncio
+async def test_setup_all_again_skips_schema_conversion(monkeypatch):
+    """Test that a second setup_all reuses the cached analyzer bodies."""
+    builder = AnalyzerBuilder(MockCUClient())
+    config = make_pipeline_config(5)
+    await builder.setup_all(config)
+
+    calls = []
+    convert = builder._convert_schema
+    monkeypatch.setattr(builder, "_convert_schema", lambda schema: calls.append(schema) or convert(schema))
+    await builder.setup_all(config)
+
+    assert calls == []
+    assert len(builder._client.created) == 12
+
+
+def test_factory_reuses_analyzer_builder():
+    """Test that the factory hands out one builder, keeping its cache warm."""
+    assert get_analyzer_builder() is get_analyzer_builder()
@@ -0,0 +1,293 @@
+"""Tests for Table Storage repositories."""
+
+import dataclasses
+from datetime import datetime, timezone
+
+import pytest
+from azure.core.exceptions import ResourceNotFoundError
+
+from src.opsai_document_orchestrator.models import (
+    AnalysisResult,
+    AnalysisSummary,
+    FeedbackRecord,
+)
+from src.opsai_document_orchestrator.repositories.table_storage import (
+    DocumentRepository,
+    FeedbackRepository,
+)
+
+CONNECTION_STRING = (
+    "DefaultEndpointsProtocol=https;AccountName=testaccount;"
+    "AccountKey=dGVzdGtleQ==;EndpointSuffix=core.windows.net"
+)
+
+
+class FakeTableClient:
+    """In-memory stand-in for azure.data.tables.TableClient."""
+
+    def __init__(self):
+        self.entities = {}
+        self.get_calls = 0
+        self.selects = []
+        self.transactions = []
+        self.queries = []
+
+    def get_entity(self, partition_key, row_key):
+        self.get_calls += 1
+        try:
+            return dict(self.entities[(partition_key, row_key)])
+        except KeyError:
+            raise ResourceNotFoundError("not found") from None
+
+    def upsert_entity(self, entity):
+        self.entities[(entity["PartitionKey"], entity["RowKey"])] = dict(entity)
+
+    def delete_entity(self, partition_key, row_key):
+        if self.entities.pop((partition_key, row_key), None) is None:
+            raise ResourceNotFoundError("not found")
+
+    def submit_transaction(self, operations):
+        self.transactions.append(len(operations))
+        for _, entity in operations:
+            self.upsert_entity(entity)
+
+    def list_entities(self, select=None):
+        # Filters are not evaluated; tests seed only matching rows
+        self.selects.append(select)
+        for entity in self.entities.values():
+            yield {k: v for k, v in entity.items() if select is None or k in select}
+
+    def query_entities(self, query_filter, parameters=None, select=None):
+        self.queries.append((query_filter, parameters))
+        return self.list_entities(select=select)
+
+
+def make_repo(repo_cls):
+    """Create repository backed by an in-memory table."""
+    repo = repo_cls(CONNECTION_STRING, "TestTable", ensure_table=False)
+    repo._table_client = FakeTableClient()
+    return repo
+
+
+@pytest.fixture
+def doc_repo():
+    """Create DocumentRepository for entity conversion tests."""
+    return make_repo(DocumentRepository)
+
+
+@pytest.fixture
+def feedback_repo():
+    """Create FeedbackRepository for entity conversion tests."""
+    return make_repo(FeedbackRepository)
+
+
+def test_analysis_result_round_trip(doc_repo):
+    """Test that an analysis result survives entity conversion."""
+    result = AnalysisResult(
+        document_id="doc-1",
+        category_id="health_claim",
+        extracted_fields={"total": 1500.0, "lines": [{"code": "A1"}]},
+        confidence=0.9,
+    )
+
+    entity = doc_repo._to_entity(result)
+    assert isinstance(entity["extracted_fields"], str)
+
+    restored = doc_repo._to_model(entity)
+    assert restored.document_id == "doc-1"
+    assert restored.category_id == "health_claim"
+    assert restored.extracted_fields == result.extracted_fields
+    assert restored.analyzed_at == result.analyzed_at
+
+
+def test_analysis_result_missing_fields_column(doc_repo):
+    """Test that a row without extracted_fields loads as empty dict."""
+    restored = doc_repo._to_model({"RowKey": "doc-1", "category_id": ""})
+
+    assert restored.extracted_fields == {}
+    assert restored.category_id is None
+
+
+def test_timestamps_stored_natively_with_legacy_fallback(doc_repo):
+    """Test that datetimes are stored as-is and ISO strings still load."""
+    result = AnalysisResult(document_id="doc-1", category_id=None, extracted_fields={})
+    entity = doc_repo._to_entity(result)
+    assert entity["analyzed_at"] is result.analyzed_at
+
+    entity["analyzed_at"] = result.analyzed_at.isoformat()
+    assert doc_repo._to_model(entity).analyzed_at == result.analyzed_at
+
+
+@pytest.mark.parametrize("naive", ["2025-01-02T03:04:05", datetime(2025, 1, 2, 3, 4, 5)])
+def test_naive_timestamps_read_as_utc(doc_repo, naive):
+    """Test that legacy naive timestamps come back timezone-aware in UTC."""
+    entity = {"RowKey": "doc-1", "analyzed_at": naive}
+
+    assert doc_repo._to_model(entity).analyzed_at == datetime(2025, 1, 2, 3, 4, 5, tzinfo=timezone.utc)
+
+
+def test_extracted_fields_decoded_on_demand(doc_repo):
+    """Test that loaded fields stay raw JSON until read and re-save as-is."""
+    entity = {"RowKey": "doc-1", "extracted_fields": '{"total": 1500.0}'}
+
+    restored = doc_repo._to_model(entity)
+    assert restored.raw_fields_json == '{"total": 1500.0}'
+    assert doc_repo._to_entity(restored)["extracted_fields"] == '{"total": 1500.0}'
+
+    assert restored.extracted_fields == {"total": 1500.0}
+    assert restored.raw_fields_json is None
+
+    restored.extracted_fields = {"total": 1600.0}
+    assert doc_repo._to_model(doc_repo._to_entity(restored)).extracted_fields == {"total": 1600.0}
+
+
+def test_lazy_result_supports_dataclass_helpers(doc_repo):
+    """Test that replace/asdict see extracted_fields on an undecoded result."""
+    restored = doc_repo._to_model({"RowKey": "doc-1", "extracted_fields": '{"total": 1.0}'})
+
+    assert [f.name for f in dataclasses.fields(restored)] == [
+        "document_id", "category_id", "extracted_fields", "confidence", "analyzed_at",
+    ]
+    assert dataclasses.replace(restored, category_id="a").extracted_fields == {"total": 1.0}
+    assert dataclasses.asdict(restored)["extracted_fields"] == {"total": 1.0}
+
+
+def test_feedback_round_trip(feedback_repo):
+    """Test that a feedback record survives entity conversion."""
+    feedback = FeedbackRecord(
+        feedback_id="fb-1",
+        document_id="doc-1",
+        corrected_fields={"total": 1600.0},
+        reviewer="reviewer",
+    )
+
+    restored = feedback_repo._to_model(feedback_repo._to_entity(feedback))
+
+    assert restored.feedback_id == "fb-1"
+    assert restored.corrected_fields == {"total": 1600.0}
+    assert restored.reviewer == "reviewer"
+    assert restored.comment is None
+
+
+def test_ensure_table_runs_once_per_table(monkeypatch):
+    """Test that create_table is only issued for the first instance."""
+    from azure.data.tables import TableClient
+
+    from src.opsai_document_orchestrator.repositories import table_storage
+
+    calls = []
+    monkeypatch.setattr(table_storage, "_ENSURED_TABLES", set())
+    monkeypatch.setattr(TableClient, "create_table", lambda self: calls.append(self.table_name))
+
+    DocumentRepository(CONNECTION_STRING, "EnsureOnce")
+    DocumentRepository(CONNECTION_STRING, "EnsureOnce")
+
+    assert calls == ["EnsureOnce"]
+
+
+def test_get_serves_repeat_reads_from_cache(doc_repo):
+    """Test that a second get does not hit the table."""
+    doc_repo.save(AnalysisResult(document_id="doc-1", category_id=None, extracted_fields={}))
+
+    first = doc_repo.get("doc-1")
+    second = doc_repo.get("doc-1")
+
+    assert second is first
+    assert doc_repo._table_client.get_calls == 1
+
+
+def test_save_and_delete_invalidate_cache(doc_repo):
+    """Test that writes are visible to the next get."""
+    doc_repo.save(AnalysisResult(document_id="doc-1", category_id="a", extracted_fields={}))
+    assert doc_repo.get("doc-1").category_id == "a"
+
+    doc_repo.save(AnalysisResult(document_id="doc-1", category_id="b", extracted_fields={}))
+    assert doc_repo.get("doc-1").category_id == "b"
+
+    doc_repo.delete("doc-1")
+    assert doc_repo.get("doc-1") is None
+
+
+def test_get_does_not_cache_misses(doc_repo):
+    """Test that a result saved after a miss is found."""
+    assert doc_repo.get("doc-1") is None
+
+    doc_repo._table_client.upsert_entity(
+        doc_repo._to_entity(AnalysisResult(document_id="doc-1", category_id=None, extracted_fields={}))
+    )
+    assert doc_repo.get("doc-1") is not None
+
+
+def test_list_by_category_fields_only_projects_columns(doc_repo):
+    """Test that fields_only selects metadata columns and skips the JSON blob."""
+    doc_repo.save(AnalysisResult(
+        document_id="doc-1",
+        category_id="health_claim",
+        extracted_fields={"total": 1500.0},
+        confidence=0.9,
+    ))
+
+    summaries = doc_repo.list_by_category("health_claim", fields_only=True)
+
+    assert doc_repo._table_client.selects == [DocumentRepository.SUMMARY_COLUMNS]
+    assert summaries == [AnalysisSummary(
+        document_id="doc-1",
+        category_id="health_claim",
+        confidence=0.9,
+        analyzed_at=summaries[0].analyzed_at,
+    )]
+    assert doc_repo.list_by_category("health_claim")[0].extracted_fields == {"total": 1500.0}
+
+
+def test_iter_all_streams_lazily(doc_repo):
+    """Test that iter_all converts rows only as they are consumed."""
+    for doc_id in ("doc-1", "doc-2"):
+        doc_repo.save(AnalysisResult(document_id=doc_id, category_id=None, extracted_fields={}))
+
+    results = doc_repo.iter_all()
+    assert doc_repo._table_client.selects == []
+
+    assert next(results).document_id == "doc-1"
+    assert [r.document_id for r in results] == ["doc-2"]
+
+
+def test_save_many_batches_by_100(doc_repo):
+    """Test that bulk saves are split into transactions of at most 100."""
+    doc_repo.get("doc-0")  # cached miss must not hide the saved row
+    doc_repo.save_many(
+        AnalysisResult(document_id=f"doc-{i}", category_id=None, extracted_fields={})
+        for i in range(250)
+    )
+
+    assert doc_repo._table_client.transactions == [100, 100, 50]
+    assert doc_repo.get("doc-0") is not None
+
+
+def test_save_many_invalidates_committed_batches_on_failure(doc_repo, monkeypatch):
+    """Test that rows from batches that committed are re-read after a later failure."""
+    doc_repo.get("doc-0")
+    submit = doc_repo._table_client.submit_transaction
+
+    def fail_second(operations):
+        if doc_repo._table_client.transactions:
+            raise RuntimeError("batch failed")
+        submit(operations)
+
+    monkeypatch.setattr(doc_repo._table_client, "submit_transaction", fail_second)
+    with pytest.raises(RuntimeError):
+        doc_repo.save_many(
+            AnalysisResult(document_id=f"doc-{i}", category_id=None, extracted_fields={})
+            for i in range(150)
+        )
+
+    assert doc_repo.get("doc-0") is not None
+
+
+def test_filters_bind_values_as_parameters(feedback_repo):
+    """Test that caller values never get spliced into the OData filter."""
+    feedback_repo.get_by_document("doc' or 'a' eq 'a")
+
+    assert feedback_repo._table_client.queries == [(
+        FeedbackRepository.DOCUMENT_FILTER,
+        {"pk": "feedback", "document_id": "doc' or 'a' eq 'a"},
+    )]